@@ -9,13 +9,27 @@ import base64
 from io import BytesIO
 import json
 import fem_solver_2d
+import mesh_generator_enhanced
 from mesh_generator_enhanced import generate_mesh_with_options
 from fem_solver_2d import solve_heat_equation_2d
-from burgers_solver import simulate_burgers
+from linear_solvers import SOLVER_METHODS
+from burgers_solver import simulate_burgers, simulate_burgers_ensemble, TIME_SCHEMES, FLUX_SCHEMES
+from burgers_solver import factor_tridiagonal, solve_factored_tridiagonal
+from snapshot_sink import SnapshotSink
+from spectral_solver_1d import spectral_heat_1d, spectral_wave_1d
 import sys
 import os
 import io
 
+# Time stepping methods of solve_heat_equation
+HEAT_METHODS = ('explicit', 'backward_euler', 'crank_nicolson', 'spectral')
+
+# Solution methods of solve_wave_equation
+WAVE_METHODS = ('finite_difference', 'spectral')
+
+# Orders of the finite-difference Laplacian of solve_wave_equation and their CFL limits
+WAVE_CFL_LIMITS = {2: 1.0, 4: np.sqrt(3) / 2}
+
 app = Flask(__name__)
 # Enable CORS with specific configuration
 CORS(app, resources={r"/api/*": {"origins": "*"}})
@@ -46,7 +60,220 @@ def health_check():
             'message': f'API health check failed: {str(e)}'
         }), 500
 
-def solve_heat_equation(length, time, num_x, num_t, diffusivity, initial_temp, boundary_type='fixed', left_value=0, right_value=0):
+@app.route("/api/cache-stats", methods=["GET"])
+def cache_stats():
+    return jsonify({
+        'factorization': fem_solver_2d.get_factorization_cache_stats(),
+        'mesh': mesh_generator_enhanced.get_mesh_cache_stats()
+    })
+
+def apply_boundary_1d(row, boundary_type, left_value, right_value, dx, order=2):
+    """
+    Apply the boundary closure of the 1D solvers to one time level in place.
+    
+    'fixed' rows keep the values set before time stepping, 'neumann' sets the
+    end values from the prescribed derivatives and 'periodic' copies the
+    second and second-to-last points to the opposite ends. order=4 uses the
+    fourth-order one-sided derivative (-25, 48, -36, 16, -3) / (12 dx) for
+    'neumann' instead of the two-point difference.
+    """
+    if boundary_type == 'neumann' and order == 4:
+        row[0] = (48 * row[1] - 36 * row[2] + 16 * row[3] - 3 * row[4] - 12 * left_value * dx) / 25
+        row[-1] = (48 * row[-2] - 36 * row[-3] + 16 * row[-4] - 3 * row[-5] + 12 * right_value * dx) / 25
+    elif boundary_type == 'neumann':
+        # Left boundary (du/dx = left_value)
+        row[0] = row[1] - left_value * dx
+        # Right boundary (du/dx = right_value)
+        row[-1] = row[-2] + right_value * dx
+    elif boundary_type == 'periodic':
+        row[0] = row[-2]
+        row[-1] = row[1]
+
+def second_difference(row, out):
+    """Write u[i+1] - 2 u[i] + u[i-1] for the interior points of row into out."""
+    np.multiply(row[1:-1], 2, out=out)
+    np.subtract(row[2:], out, out=out)
+    out += row[:-2]
+    return out
+
+def fourth_difference(row, out, boundary_type, left_value, right_value, dx, padded):
+    """
+    Write (-u[i-2] + 16 u[i-1] - 30 u[i] + 16 u[i+1] - u[i+2]) / 12 for the
+    interior points of row into out, the fourth-order counterpart of
+    second_difference.
+    
+    The stencil reaches one point beyond each end. padded (len(row) + 2
+    values) receives row with these ghost points: an odd reflection about the
+    boundary value for 'fixed', the value that makes the fourth-order
+    derivative (-3, -10, 18, -6, 1) / (12 dx) over the ghost and the first
+    four points match the prescribed derivative for 'neumann' (the same order
+    as the end values set by apply_boundary_1d(order=4)), and the wrapped
+    values for 'periodic'.
+    """
+    padded[1:-1] = row
+    if boundary_type == 'fixed':
+        padded[0] = 2 * left_value - row[1]
+        padded[-1] = 2 * right_value - row[-2]
+    elif boundary_type == 'neumann':
+        padded[0] = (-10 * row[0] + 18 * row[1] - 6 * row[2] + row[3] - 12 * left_value * dx) / 3
+        padded[-1] = (-10 * row[-1] + 18 * row[-2] - 6 * row[-3] + row[-4] + 12 * right_value * dx) / 3
+    else:
+        # One period spans len(row) - 2 points (row[0] = row[-2])
+        padded[0] = row[-3]
+        padded[-1] = row[2]
+    np.add(padded[1:-3], padded[3:-1], out=out)
+    out *= 16
+    out -= padded[:-4]
+    out -= padded[4:]
+    out -= 30 * padded[2:-2]
+    out /= 12
+    return out
+
+def factor_heat_system_1d(num_x, r, theta, boundary_type):
+    """
+    Factor the implicit heat matrix (I - theta * r * D2) over the interior
+    points once so every time step only needs a tridiagonal back substitution.
+    
+    'fixed' ends enter through the right-hand side, 'neumann' ends fold the
+    one-sided closure into the first and last rows, and 'periodic' ends
+    (u[0] = u[-2], u[-1] = u[1]) make the matrix cyclic, which is solved with
+    the Sherman-Morrison formula around the factored tridiagonal part. The
+    cyclic correction needs at least three interior points (num_x >= 5).
+    
+    Parameters:
+    num_x (int): Number of grid points
+    r (float): alpha * dt / dx^2
+    theta (float): 1 for backward Euler, 0.5 for Crank-Nicolson
+    boundary_type (str): 'fixed', 'neumann' or 'periodic'
+    
+    Returns:
+    dict: Factors and Sherman-Morrison correction used by solve_heat_system_1d
+    """
+    m = num_x - 2
+    off_diagonal = np.full(m, -theta * r)
+    diagonal = np.full(m, 1 + 2 * theta * r)
+    system = {'cyclic': boundary_type == 'periodic'}
+    if boundary_type == 'neumann':
+        diagonal[0] -= theta * r
+        diagonal[-1] -= theta * r
+    if system['cyclic']:
+        # A = T + w v^T with corner entries -theta*r; T absorbs gamma on the diagonal
+        corner = -theta * r
+        gamma = -diagonal[0]
+        diagonal[0] -= gamma
+        diagonal[-1] -= corner * corner / gamma
+        system['factors'] = factor_tridiagonal(off_diagonal, diagonal, off_diagonal)
+        w = np.zeros(m)
+        w[0] = gamma
+        w[-1] = corner
+        v = np.zeros(m)
+        v[0] = 1.0
+        v[-1] = corner / gamma
+        z = solve_factored_tridiagonal(system['factors'], w)
+        system['z'] = z
+        system['v'] = v
+        system['denominator'] = 1.0 + v @ z
+    else:
+        system['factors'] = factor_tridiagonal(off_diagonal, diagonal, off_diagonal)
+    return system
+
+def solve_heat_system_1d(system, rhs):
+    """Solve the factored implicit heat system for one right-hand side."""
+    y = solve_factored_tridiagonal(system['factors'], rhs)
+    if system['cyclic']:
+        y -= (system['v'] @ y) / system['denominator'] * system['z']
+    return y
+
+def time_steps_1d(time, num_t, dt, dt_limit):
+    """
+    Choose the internal time step of a 1D solver.
+    
+    dt=None keeps the legacy grid of num_t time levels, 'auto' takes the
+    largest uniform step not above dt_limit, and a number is used as an upper
+    bound. The step is shrunk so that a whole number of steps ends at time.
+    
+    Returns:
+    tuple: Number of steps and the step size, or (None, error message)
+    """
+    if dt is None:
+        n_steps = num_t - 1
+    else:
+        if dt == 'auto':
+            dt = dt_limit
+        else:
+            try:
+                dt = float(dt)
+            except (TypeError, ValueError):
+                return None, f"Invalid time step: {dt}. Use a positive number or 'auto'"
+        if not dt > 0:
+            return None, "Time step (dt) must be positive"
+        n_steps = max(1, int(np.ceil(time / dt)))
+        # Guard the stability limit against rounding in time / n_steps
+        if time / n_steps > dt:
+            n_steps += 1
+    return n_steps, time / n_steps
+
+def parse_output_stride(output_stride):
+    """
+    Convert an output stride (number of steps between stored levels) to int.
+    
+    Returns:
+    tuple: The stride (None if not given), or (None, error message) unless it
+           is a whole number of at least 1
+    """
+    if output_stride is None:
+        return None, None
+    try:
+        stride = float(output_stride)
+    except (TypeError, ValueError):
+        stride = np.nan
+    if isinstance(output_stride, bool) or not stride.is_integer() or stride < 1:
+        return None, f"Invalid output stride: {output_stride}. Use a whole number of at least 1"
+    return int(stride), None
+
+def output_steps_1d(n_steps, time, num_t, output_times=None, output_stride=None):
+    """
+    Step indices whose solution is stored: the steps nearest to output_times,
+    every output_stride-th step (and the last), or otherwise num_t levels spread
+    evenly over the run (every step for the legacy grid of num_t levels). An
+    empty output_times selection falls back to the num_t levels.
+    
+    Returns:
+    array: Sorted unique step indices
+    """
+    if output_times is not None and len(output_times) > 0:
+        steps = np.rint(np.asarray(output_times, dtype=float) / time * n_steps)
+    elif output_stride is not None:
+        steps = np.append(np.arange(0, n_steps + 1, output_stride), n_steps)
+    else:
+        steps = np.rint(np.linspace(0, n_steps, num_t))
+    return np.unique(np.clip(steps, 0, n_steps).astype(int))
+
+def step_times_1d(steps, n_steps, time):
+    """Times of the given step indices, matching np.linspace(0, time, n_steps + 1)."""
+    times = steps * (time / n_steps)
+    times[steps == n_steps] = time
+    return times
+
+def spectral_output_times_1d(time, num_t, dt=None, output_times=None, output_stride=None):
+    """
+    Output times of a spectral run. Without time stepping, output_times are
+    used exactly (clipped to [0, time]); otherwise the levels are those of
+    output_steps_1d on the grid of time_steps_1d.
+    
+    Returns:
+    tuple: Sorted unique times, or (None, error message)
+    """
+    if output_times is not None and len(output_times) > 0:
+        return np.unique(np.clip(np.asarray(output_times, dtype=float), 0, time)), None
+    n_steps, dt = time_steps_1d(time, num_t, dt, time / (num_t - 1))
+    if n_steps is None:
+        return None, dt
+    steps = output_steps_1d(n_steps, time, num_t, output_stride=output_stride)
+    return step_times_1d(steps, n_steps, time), None
+
+def solve_heat_equation(length, time, num_x, num_t, diffusivity, initial_temp, boundary_type='fixed', left_value=0, right_value=0, method='explicit',
+                        dt=None, output_times=None, output_stride=None, spectral_check=False):
     """
     Solve the 1D heat equation using finite differences
     u_t = alpha * u_xx
@@ -55,162 +282,353 @@ def solve_heat_equation(length, time, num_x, num_t, diffusivity, initial_temp, b
     - 'fixed': Dirichlet boundary conditions (fixed values)
     - 'neumann': Neumann boundary conditions (fixed derivatives)
     - 'periodic': Periodic boundary conditions
+    
+    method options:
+    - 'explicit': forward Euler, requires alpha*dt/dx^2 <= 0.5
+    - 'backward_euler': implicit, unconditionally stable, first order in time
+    - 'crank_nicolson': implicit, unconditionally stable, second order in time
+    - 'spectral': eigenfunction expansion evaluated at the output times
+      directly, without time stepping (see spectral_solver_1d)
+    
+    The internal step dt defaults to the grid of num_t time levels; 'auto'
+    uses the explicit stability limit (the output spacing for the implicit
+    methods). Only the levels selected by output_times, output_stride or
+    num_t (see output_steps_1d) are stored, so memory follows the number of
+    outputs rather than the number of steps. With spectral_check, the result
+    also reports the largest deviation from the spectral solution as
+    "spectral_error".
     """
     # Spatial grid
     x = np.linspace(0, length, num_x)
     dx = x[1] - x[0]
     
-    # Time grid
-    t = np.linspace(0, time, num_t)
-    dt = t[1] - t[0]
+    if boundary_type not in ('fixed', 'neumann', 'periodic'):
+        return {"error": f"Unknown boundary type: {boundary_type}"}
+    if method not in HEAT_METHODS:
+        return {"error": f"Unknown method: {method}. Choose one of {', '.join(HEAT_METHODS)}"}
+    if method in ('backward_euler', 'crank_nicolson') and num_x < 5:
+        return {"error": f"The implicit methods need at least 5 grid points (num_x = {num_x})"}
+    output_stride, message = parse_output_stride(output_stride)
+    if message is not None:
+        return {"error": message}
     
-    # Initialize solution array
-    u = np.zeros((num_t, num_x))
+    alpha = diffusivity
+    if method == 'spectral':
+        times, message = spectral_output_times_1d(time, num_t, dt, output_times, output_stride)
+        if times is None:
+            return {"error": message}
+        u = spectral_heat_1d(x, initial_temp, alpha, times, boundary_type, left_value, right_value)
+        return {
+            "x": x.tolist(),
+            "t": times.tolist(),
+            "u": u.tolist(),
+            "boundary_type": boundary_type,
+            "left_value": left_value,
+            "right_value": right_value,
+            "method": method,
+            "dt": None,
+            "num_steps": 0
+        }
     
-    # Set initial condition
-    u[0, :] = initial_temp
+    # Internal time step (the implicit methods are unconditionally stable)
+    if method == 'explicit':
+        dt_limit = 0.5 * dx * dx / alpha
+    else:
+        dt_limit = time / (num_t - 1)
+    n_steps, dt = time_steps_1d(time, num_t, dt, dt_limit)
+    if n_steps is None:
+        return {"error": dt}
+    
+    # Stability criterion
+    stability = alpha * dt / (dx * dx)
+    
+    if method == 'explicit' and stability > 0.5:
+        return {"error": f"Stability criterion not met. Please reduce dt or increase dx, or use an implicit method. Current value: {stability}, should be <= 0.5"}
+    
+    # Only the selected time levels are stored
+    steps = output_steps_1d(n_steps, time, num_t, output_times, output_stride)
+    u = np.zeros((len(steps), num_x))
+    
+    # Two rolling time levels, with the initial condition
+    current = np.zeros(num_x)
+    current[:] = initial_temp
     
     # Set boundary conditions
     if boundary_type == 'fixed':
         # Dirichlet boundary conditions (fixed values)
-        u[:, 0] = left_value
-        u[:, -1] = right_value
-    elif boundary_type == 'neumann':
-        # Neumann boundary conditions will be handled in the solver loop
-        pass
+        current[0] = left_value
+        current[-1] = right_value
     elif boundary_type == 'periodic':
-        # Periodic boundary conditions will be handled in the solver loop
-        pass
-    else:
-        return {"error": f"Unknown boundary type: {boundary_type}"}
-    
-    # Stability criterion
-    alpha = diffusivity
-    stability = alpha * dt / (dx * dx)
+        # Start from data that satisfies u[0] = u[-2], u[-1] = u[1]
+        apply_boundary_1d(current, boundary_type, left_value, right_value, dx)
+    # Neumann boundary conditions are handled in the solver loop
+    following = current.copy()
     
-    if stability > 0.5:
-        return {"error": f"Stability criterion not met. Please reduce dt or increase dx. Current value: {stability}, should be <= 0.5"}
+    stored = 0
+    if len(steps) > 0 and steps[0] == 0:
+        u[0] = current
+        stored = 1
     
-    # Solve using explicit finite differences
-    for n in range(0, num_t - 1):
-        # Interior points
-        for i in range(1, num_x - 1):
-            u[n + 1, i] = u[n, i] + alpha * dt / (dx * dx) * (u[n, i + 1] - 2 * u[n, i] + u[n, i - 1])
+    r = alpha * dt / (dx * dx)
+    laplacian = np.empty(num_x - 2)
+    if method != 'explicit':
+        # theta-method: (I - theta r D2) u^{n+1} = (I + (1 - theta) r D2) u^n
+        theta = 1.0 if method == 'backward_euler' else 0.5
+        system = factor_heat_system_1d(num_x, r, theta, boundary_type)
+        rhs = np.empty(num_x - 2)
+    for n in range(0, n_steps):
+        if method == 'explicit':
+            # Explicit finite differences, all interior points at once
+            second_difference(current, laplacian)
+            laplacian *= r
+            np.add(current[1:-1], laplacian, out=following[1:-1])
+        else:
+            second_difference(current, laplacian)
+            np.multiply(laplacian, (1 - theta) * r, out=rhs)
+            rhs += current[1:-1]
+            
+            # Known boundary contributions of the new time level
+            if boundary_type == 'fixed':
+                rhs[0] += theta * r * left_value
+                rhs[-1] += theta * r * right_value
+            elif boundary_type == 'neumann':
+                rhs[0] -= theta * r * left_value * dx
+                rhs[-1] += theta * r * right_value * dx
+            
+            following[1:-1] = solve_heat_system_1d(system, rhs)
+        
+        # Handle boundary conditions ('fixed' values are already set above)
+        apply_boundary_1d(following, boundary_type, left_value, right_value, dx)
+        current, following = following, current
         
-        # Handle boundary conditions
-        if boundary_type == 'fixed':
-            # Already set above
-            pass
-        elif boundary_type == 'neumann':
-            # Left boundary (du/dx = left_value)
-            u[n + 1, 0] = u[n + 1, 1] - left_value * dx
-            # Right boundary (du/dx = right_value)
-            u[n + 1, -1] = u[n + 1, -2] + right_value * dx
-        elif boundary_type == 'periodic':
-            # Copy the second point to the last point and the second-to-last point to the first
-            u[n + 1, 0] = u[n + 1, -2]
-            u[n + 1, -1] = u[n + 1, 1]
+        if stored < len(steps) and steps[stored] == n + 1:
+            u[stored] = current
+            stored += 1
     
-    return {
+    times = step_times_1d(steps, n_steps, time)
+    result = {
         "x": x.tolist(),
-        "t": t.tolist(),
+        "t": times.tolist(),
         "u": u.tolist(),
         "boundary_type": boundary_type,
         "left_value": left_value,
-        "right_value": right_value
+        "right_value": right_value,
+        "method": method,
+        "dt": dt,
+        "num_steps": n_steps
     }
+    if spectral_check:
+        reference = spectral_heat_1d(x, initial_temp, alpha, times, boundary_type, left_value, right_value)
+        result["spectral_error"] = float(np.abs(u - reference).max())
+    return result
 
-def solve_wave_equation(length, time, num_x, num_t, wave_speed, initial_displacement, initial_velocity, boundary_type='fixed', left_value=0, right_value=0):
+def plan_wave_run(length, time, num_x, num_t, wave_speed, dt=None, output_times=None, output_stride=None, spatial_order=2):
     """
-    Solve the 1D wave equation using finite differences
-    u_tt = c^2 * u_xx
+    Grid, internal time step and stored levels of a 1D wave run (see
+    time_steps_1d and output_steps_1d), after checking the CFL condition of
+    the spatial order (c*dt/dx <= 1 for order 2, sqrt(3)/2 for order 4).
     
-    boundary_type options:
-    - 'fixed': Dirichlet boundary conditions (fixed values)
-    - 'neumann': Neumann boundary conditions (fixed derivatives)
-    - 'periodic': Periodic boundary conditions
+    Returns:
+    dict: x, dx, c, dt, num_steps, steps and times of the stored levels and
+          spatial_order, or {"error": message}
     """
     # Spatial grid
     x = np.linspace(0, length, num_x)
     dx = x[1] - x[0]
     
-    # Time grid
-    t = np.linspace(0, time, num_t)
-    dt = t[1] - t[0]
+    output_stride, message = parse_output_stride(output_stride)
+    if message is not None:
+        return {"error": message}
+    if spatial_order not in WAVE_CFL_LIMITS:
+        return {"error": f"Unknown spatial order: {spatial_order}. Choose one of {', '.join(map(str, WAVE_CFL_LIMITS))}"}
+    cfl_limit = WAVE_CFL_LIMITS[spatial_order]
+    
+    # Internal time step
+    c = wave_speed
+    n_steps, dt = time_steps_1d(time, num_t, dt, cfl_limit * dx / c)
+    if n_steps is None:
+        return {"error": dt}
+    
+    # Stability criterion
+    stability = c * dt / dx
+    
+    if stability > cfl_limit:
+        return {"error": f"Stability criterion not met. Please reduce dt or increase dx. Current value: {stability}, should be <= {cfl_limit}"}
+    
+    steps = output_steps_1d(n_steps, time, num_t, output_times, output_stride)
+    return {
+        "x": x,
+        "dx": dx,
+        "c": c,
+        "dt": dt,
+        "num_steps": n_steps,
+        "steps": steps,
+        "times": step_times_1d(steps, n_steps, time),
+        "spatial_order": spatial_order
+    }
+
+def wave_equation_snapshots(plan, initial_displacement, initial_velocity, boundary_type='fixed', left_value=0, right_value=0):
+    """
+    Time-step the 1D wave equation with three rolling time levels and yield
+    (t, u) for every level stored by the plan from plan_wave_run.
+    
+    Memory stays at three rows of num_x values however long the run is. The
+    yielded u is one of the rolling buffers and is overwritten two steps later,
+    so consumers that keep it must copy it (SnapshotSink.append does).
+    The Laplacian follows the plan's spatial_order (second_difference or
+    fourth_difference).
+    """
+    dx, c, dt = plan["dx"], plan["c"], plan["dt"]
+    steps, times = plan["steps"], plan["times"]
+    num_x = len(plan["x"])
     
-    # Initialize solution array
-    u = np.zeros((num_t, num_x))
+    if plan.get("spatial_order", 2) == 4:
+        padded = np.empty(num_x + 2)
+        def difference(row, out):
+            return fourth_difference(row, out, boundary_type, left_value, right_value, dx, padded)
+    else:
+        difference = second_difference
     
-    # Set initial displacement
-    u[0, :] = initial_displacement
+    # Three rolling time levels, starting from the initial displacement
+    previous = np.zeros(num_x)
+    previous[:] = initial_displacement
     
     # Set boundary conditions
     if boundary_type == 'fixed':
         # Dirichlet boundary conditions (fixed values)
-        u[:, 0] = left_value
-        u[:, -1] = right_value
-    elif boundary_type == 'neumann':
-        # Neumann boundary conditions will be handled in the solver loop
-        pass
+        previous[0] = left_value
+        previous[-1] = right_value
     elif boundary_type == 'periodic':
-        # Periodic boundary conditions will be handled in the solver loop
-        pass
-    else:
-        return {"error": f"Unknown boundary type: {boundary_type}"}
+        # Start from data that satisfies u[0] = u[-2], u[-1] = u[1]
+        apply_boundary_1d(previous, boundary_type, left_value, right_value, dx)
+    # Neumann boundary conditions are handled in the solver loop
+    current = previous.copy()
+    following = previous.copy()
     
-    # Stability criterion
-    c = wave_speed
-    stability = c * dt / dx
+    stored = 0
+    if len(steps) > 0 and steps[0] == 0:
+        yield times[0], previous
+        stored = 1
     
-    if stability > 1.0:
-        return {"error": f"Stability criterion not met. Please reduce dt or increase dx. Current value: {stability}, should be <= 1.0"}
+    laplacian = np.empty(num_x - 2)
     
     # Set up second time step using initial velocity
-    for i in range(1, num_x - 1):
-        u[1, i] = u[0, i] + initial_velocity[i] * dt + 0.5 * c * c * dt * dt / (dx * dx) * (u[0, i + 1] - 2 * u[0, i] + u[0, i - 1])
+    velocity = np.asarray(initial_velocity, dtype=float)
+    difference(previous, laplacian)
+    laplacian *= 0.5 * c * c * dt * dt / (dx * dx)
+    np.multiply(velocity[1:-1], dt, out=current[1:-1])
+    current[1:-1] += previous[1:-1]
+    current[1:-1] += laplacian
     
     # Handle boundary conditions for the second time step
-    if boundary_type == 'fixed':
-        # Already set above
-        pass
-    elif boundary_type == 'neumann':
-        # Left boundary (du/dx = left_value)
-        u[1, 0] = u[1, 1] - left_value * dx
-        # Right boundary (du/dx = right_value)
-        u[1, -1] = u[1, -2] + right_value * dx
-    elif boundary_type == 'periodic':
-        # Copy the second point to the last point and the second-to-last point to the first
-        u[1, 0] = u[1, -2]
-        u[1, -1] = u[1, 1]
-    
-    # Solve using explicit finite differences
-    for n in range(1, num_t - 1):
-        # Interior points
-        for i in range(1, num_x - 1):
-            u[n + 1, i] = 2 * u[n, i] - u[n - 1, i] + c * c * dt * dt / (dx * dx) * (u[n, i + 1] - 2 * u[n, i] + u[n, i - 1])
+    apply_boundary_1d(current, boundary_type, left_value, right_value, dx, plan.get("spatial_order", 2))
+    if stored < len(steps) and steps[stored] == 1:
+        yield times[stored], current
+        stored += 1
+    
+    # Solve using explicit finite differences, all interior points at once
+    courant_sq = c * c * dt * dt / (dx * dx)
+    for n in range(1, plan["num_steps"]):
+        difference(current, laplacian)
+        laplacian *= courant_sq
+        np.multiply(current[1:-1], 2, out=following[1:-1])
+        following[1:-1] -= previous[1:-1]
+        following[1:-1] += laplacian
+        
+        # Handle boundary conditions ('fixed' values are already set above)
+        apply_boundary_1d(following, boundary_type, left_value, right_value, dx, plan.get("spatial_order", 2))
+        previous, current, following = current, following, previous
         
-        # Handle boundary conditions
-        if boundary_type == 'fixed':
-            # Already set above
-            pass
-        elif boundary_type == 'neumann':
-            # Left boundary (du/dx = left_value)
-            u[n + 1, 0] = u[n + 1, 1] - left_value * dx
-            # Right boundary (du/dx = right_value)
-            u[n + 1, -1] = u[n + 1, -2] + right_value * dx
-        elif boundary_type == 'periodic':
-            # Copy the second point to the last point and the second-to-last point to the first
-            u[n + 1, 0] = u[n + 1, -2]
-            u[n + 1, -1] = u[n + 1, 1]
+        if stored < len(steps) and steps[stored] == n + 1:
+            yield times[stored], current
+            stored += 1
+
+def solve_wave_equation(length, time, num_x, num_t, wave_speed, initial_displacement, initial_velocity, boundary_type='fixed', left_value=0, right_value=0,
+                        dt=None, output_times=None, output_stride=None, output_file=None, method='finite_difference', spectral_check=False,
+                        spatial_order=2):
+    """
+    Solve the 1D wave equation using finite differences
+    u_tt = c^2 * u_xx
     
-    return {
+    boundary_type options:
+    - 'fixed': Dirichlet boundary conditions (fixed values)
+    - 'neumann': Neumann boundary conditions (fixed derivatives)
+    - 'periodic': Periodic boundary conditions
+    
+    spatial_order 4 replaces the three-point Laplacian by the fourth-order
+    five-point stencil (see fourth_difference), which reaches the same
+    accuracy on a much coarser grid under the tighter CFL limit sqrt(3)/2.
+    
+    The internal step dt defaults to the grid of num_t time levels; 'auto'
+    uses the CFL limit of the spatial order. Only the selected time levels are stored,
+    as in solve_heat_equation, in memory or, with output_file, in a
+    memory-mapped .npy file whose path and shape are returned instead of u.
+    For streaming without storing anything, iterate wave_equation_snapshots.
+    
+    method='spectral' evaluates the eigenfunction expansion at the output
+    times instead of time stepping (see spectral_solver_1d) and has no
+    spatial_order; spectral_check reports the largest deviation of the
+    finite-difference solution from it as "spectral_error".
+    """
+    if boundary_type not in ('fixed', 'neumann', 'periodic'):
+        return {"error": f"Unknown boundary type: {boundary_type}"}
+    if method not in WAVE_METHODS:
+        return {"error": f"Unknown method: {method}. Choose one of {', '.join(WAVE_METHODS)}"}
+    if spatial_order not in WAVE_CFL_LIMITS:
+        return {"error": f"Unknown spatial order: {spatial_order}. Choose one of {', '.join(map(str, WAVE_CFL_LIMITS))}"}
+    if method != 'spectral' and spatial_order == 4 and boundary_type == 'neumann' and num_x < 7:
+        # Smaller grids overlap (or leave no room for) the five-point closures at both ends
+        return {"error": f"Fourth order with neumann ends needs at least 7 grid points (num_x = {num_x})"}
+    
+    if method == 'spectral':
+        output_stride, message = parse_output_stride(output_stride)
+        if message is not None:
+            return {"error": message}
+        times, message = spectral_output_times_1d(time, num_t, dt, output_times, output_stride)
+        if times is None:
+            return {"error": message}
+        x = np.linspace(0, length, num_x)
+        sink = SnapshotSink(len(times), num_x, path=output_file)
+        levels = spectral_wave_1d(x, initial_displacement, initial_velocity, wave_speed, times,
+                                  boundary_type, left_value, right_value)
+        for t_level, u_level in zip(times, levels):
+            sink.append(t_level, u_level)
+        dt, n_steps = None, 0
+    else:
+        plan = plan_wave_run(length, time, num_x, num_t, wave_speed, dt, output_times, output_stride, spatial_order)
+        if "error" in plan:
+            return plan
+        
+        x = plan["x"]
+        sink = SnapshotSink(len(plan["steps"]), num_x, path=output_file)
+        for t_level, u_level in wave_equation_snapshots(plan, initial_displacement, initial_velocity,
+                                                        boundary_type, left_value, right_value):
+            sink.append(t_level, u_level)
+        dt, n_steps = plan["dt"], plan["num_steps"]
+    times, u = sink.result()
+    
+    result = {
         "x": x.tolist(),
-        "t": t.tolist(),
-        "u": u.tolist(),
+        "t": times.tolist(),
         "boundary_type": boundary_type,
         "left_value": left_value,
-        "right_value": right_value
+        "right_value": right_value,
+        "method": method,
+        "dt": dt,
+        "num_steps": n_steps
     }
+    if method != 'spectral':
+        result["spatial_order"] = spatial_order
+    if output_file is None:
+        result["u"] = u.tolist()
+    else:
+        result["u_file"] = output_file
+        result["shape"] = list(u.shape)
+    if spectral_check and method != 'spectral':
+        reference = spectral_wave_1d(x, initial_displacement, initial_velocity, wave_speed, times,
+                                     boundary_type, left_value, right_value)
+        result["spectral_error"] = float(np.abs(u - reference).max())
+    return result
 
 def generate_plot(x, u, t, time_indices, title):
     plt.figure(figsize=(12, 8))
@@ -285,6 +703,18 @@ def heat_equation_endpoint():
     left_value = data.get('left_value', 0)
     right_value = data.get('right_value', 0)
     
+    # Solution method ('explicit', 'backward_euler', 'crank_nicolson' or 'spectral')
+    method = data.get('method', 'explicit')
+    
+    # Report the deviation from the spectral solution
+    spectral_check = bool(data.get('spectral_check', False))
+    
+    # Internal time step (None: num_t levels, 'auto': stability limit) and output stride
+    dt = data.get('dt', None)
+    output_stride, message = parse_output_stride(data.get('output_stride', None))
+    if message is not None:
+        return jsonify({"error": message}), 400
+    
     # Get selected time steps or use defaults
     selected_times = data.get('selected_times', None)
     
@@ -300,15 +730,21 @@ def heat_equation_endpoint():
         initial_temp_values,
         boundary_type,
         left_value,
-        right_value
+        right_value,
+        method,
+        dt=dt,
+        output_times=selected_times,
+        output_stride=output_stride,
+        spectral_check=spectral_check
     )
     
     if "error" in result:
         return jsonify(result), 400
     
     # Default time indices if none provided
-    if selected_times is None:
-        time_indices = [0, num_t // 4, num_t // 2, 3 * num_t // 4, num_t - 1]
+    num_out = len(result["t"])
+    if not selected_times:
+        time_indices = [0, num_out // 4, num_out // 2, 3 * num_out // 4, num_out - 1]
     else:
         # Convert selected times to nearest indices
         time_array = np.array(result["t"])
@@ -358,6 +794,19 @@ def wave_equation_endpoint():
     left_value = data.get('left_value', 0)
     right_value = data.get('right_value', 0)
     
+    # Solution method ('finite_difference' or 'spectral') and order of the finite-difference Laplacian (2 or 4)
+    method = data.get('method', 'finite_difference')
+    spatial_order = data.get('spatial_order', 2)
+    
+    # Report the deviation from the spectral solution
+    spectral_check = bool(data.get('spectral_check', False))
+    
+    # Internal time step (None: num_t levels, 'auto': CFL limit) and output stride
+    dt = data.get('dt', None)
+    output_stride, message = parse_output_stride(data.get('output_stride', None))
+    if message is not None:
+        return jsonify({"error": message}), 400
+    
     # Get selected time steps or use defaults
     selected_times = data.get('selected_times', None)
     
@@ -381,15 +830,22 @@ def wave_equation_endpoint():
         initial_velocity,
         boundary_type,
         left_value,
-        right_value
+        right_value,
+        dt=dt,
+        output_times=selected_times,
+        output_stride=output_stride,
+        method=method,
+        spectral_check=spectral_check,
+        spatial_order=spatial_order
     )
     
     if "error" in result:
         return jsonify(result), 400
     
     # Default time indices if none provided
-    if selected_times is None:
-        time_indices = [0, num_t // 4, num_t // 2, 3 * num_t // 4, num_t - 1]
+    num_out = len(result["t"])
+    if not selected_times:
+        time_indices = [0, num_out // 4, num_out // 2, 3 * num_out // 4, num_out - 1]
     else:
         # Convert selected times to nearest indices
         time_array = np.array(result["t"])
@@ -423,11 +879,13 @@ def wave_equation_endpoint():
         "selected_times": [result["t"][idx] for idx in time_indices]
     })
 
-@app.route('/api/heat-equation-2d', methods=['POST'])
-def heat_equation_2d_endpoint():
-    data = request.json
-    print("Received 2D heat equation request with data:", data)
+def parse_heat_2d_options(data):
+    """
+    Extract and validate geometry and solver options of a 2D heat request.
     
+    Returns:
+    tuple: Keyword arguments for the 2D solver and an error message (or None)
+    """
     # Extract parameters with defaults
     width = float(data.get('width', 10.0))
     height = float(data.get('height', 10.0))
@@ -440,17 +898,32 @@ def heat_equation_2d_endpoint():
     hole_cols = int(data.get('hole_cols', 1))
     hole_radius = float(data.get('hole_radius', 0.1))
     
+    # Extract linear solver options
+    solver = str(data.get('solver', 'auto'))
+    solver_tol = float(data.get('solver_tol', 1e-10))
+    use_cache = bool(data.get('use_cache', True))
+    superposition = bool(data.get('superposition', False))
+    mesh_type = str(data.get('mesh_type', 'auto'))
+    
     print(f"Hole parameters: with_holes={with_holes}, hole_rows={hole_rows}, hole_cols={hole_cols}, hole_radius={hole_radius}")
     
     # Validate parameters
     if mesh_density <= 0:
-        return jsonify({"error": "Mesh density must be positive"}), 400
+        return None, "Mesh density must be positive"
     if mesh_quality <= 0:
-        return jsonify({"error": "Mesh quality must be positive"}), 400
+        return None, "Mesh quality must be positive"
     if with_holes and (hole_rows <= 0 or hole_cols <= 0):
-        return jsonify({"error": "Hole rows and columns must be positive"}), 400
+        return None, "Hole rows and columns must be positive"
     if with_holes and hole_radius <= 0:
-        return jsonify({"error": "Hole radius must be positive"}), 400
+        return None, "Hole radius must be positive"
+    if solver not in SOLVER_METHODS:
+        return None, f"Solver must be one of: {', '.join(SOLVER_METHODS)}"
+    if solver_tol <= 0:
+        return None, "Solver tolerance must be positive"
+    if mesh_type not in fem_solver_2d.MESH_TYPES:
+        return None, f"Mesh type must be one of: {', '.join(fem_solver_2d.MESH_TYPES)}"
+    if mesh_type == 'structured' and with_holes:
+        return None, "Structured meshes are only available without holes"
     
     # Check if holes would overlap or extend beyond domain
     if with_holes:
@@ -459,30 +932,47 @@ def heat_equation_2d_endpoint():
         min_spacing = min(x_spacing, y_spacing)
         
         if hole_radius * 2 >= min_spacing:
-            return jsonify({"error": f"Hole radius too large for the given domain and number of holes. Maximum radius: {min_spacing/2:.4f}"}), 400
+            return None, f"Hole radius too large for the given domain and number of holes. Maximum radius: {min_spacing/2:.4f}"
     
+    return {
+        "width": width,
+        "height": height,
+        "mesh_density": mesh_density,
+        "mesh_quality": mesh_quality,
+        "with_holes": with_holes,
+        "hole_rows": hole_rows,
+        "hole_cols": hole_cols,
+        "hole_radius": hole_radius,
+        "solver": solver,
+        "solver_tol": solver_tol,
+        "use_cache": use_cache,
+        "superposition": superposition,
+        "mesh_type": mesh_type
+    }, None
+
+def parse_bc_values_2d(data):
     # Extract boundary condition values
-    bc_values = {
+    return {
         1: float(data.get('bottom_value', 0)),  # Bottom edge (y = 0)
         2: float(data.get('left_value', 0)),    # Left edge (x = 0)
         3: float(data.get('top_value', 1)),     # Top edge (y = height)
         4: float(data.get('right_value', 1)),   # Right edge (x = width)
         5: float(data.get('hole_value', 1))     # Hole boundary (if with_holes=True)
     }
+
+@app.route('/api/heat-equation-2d', methods=['POST'])
+def heat_equation_2d_endpoint():
+    data = request.json
+    print("Received 2D heat equation request with data:", data)
+    
+    options, error = parse_heat_2d_options(data)
+    if error:
+        return jsonify({"error": error}), 400
+    bc_values = parse_bc_values_2d(data)
     
     # Solve the 2D heat equation
     try:
-        result = fem_solver_2d.solve_heat_equation_2d(
-            width=width,
-            height=height,
-            mesh_density=mesh_density,
-            mesh_quality=mesh_quality,
-            bc_values=bc_values,
-            with_holes=with_holes,
-            hole_rows=hole_rows,
-            hole_cols=hole_cols,
-            hole_radius=hole_radius
-        )
+        result = fem_solver_2d.solve_heat_equation_2d(bc_values=bc_values, **options)
         return jsonify(result)
     except Exception as e:
         import traceback
@@ -490,6 +980,39 @@ def heat_equation_2d_endpoint():
         print(error_msg)
         return jsonify({"error": error_msg}), 400
 
+@app.route('/api/heat-equation-2d/batch', methods=['POST'])
+def heat_equation_2d_batch_endpoint():
+    data = request.json
+    # Each scenario carries its own boundary values and plot flag
+    scenarios = data.get('scenarios', [])
+    print("Received 2D heat equation batch request with", len(scenarios) if isinstance(scenarios, list) else 0, "scenarios")
+    
+    options, error = parse_heat_2d_options(data)
+    if error:
+        return jsonify({"error": error}), 400
+    
+    if not isinstance(scenarios, list) or not scenarios:
+        return jsonify({"error": "Scenarios must be a non-empty list of boundary value sets"}), 400
+    if not all(isinstance(scenario, dict) for scenario in scenarios):
+        return jsonify({"error": "Each scenario must be an object of boundary values"}), 400
+    try:
+        bc_values_list = [parse_bc_values_2d(scenario) for scenario in scenarios]
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid boundary value: {str(e)}"}), 400
+    default_plots = bool(data.get('include_plots', False))
+    include_plots = [bool(scenario.get('include_plots', default_plots)) for scenario in scenarios]
+    
+    try:
+        result = fem_solver_2d.solve_heat_equation_2d_batch(
+            bc_values_list=bc_values_list, include_plots=include_plots, **options
+        )
+        return jsonify(result)
+    except Exception as e:
+        import traceback
+        error_msg = f"Error in 2D heat equation batch solver: {str(e)}\n{traceback.format_exc()}"
+        print(error_msg)
+        return jsonify({"error": error_msg}), 400
+
 @app.route('/api/burgers-equation', methods=['POST'])
 def burgers_equation():
     try:
@@ -516,6 +1039,12 @@ def burgers_equation():
             left_value = float(data['left_value'])
             right_value = float(data['right_value'])
             ic_type = str(data['ic_type'])
+            newton_tol = float(data.get('newton_tol', 1e-10))
+            time_tol = float(data.get('time_tol', 1e-3))
+            save_every = int(data.get('save_every', 0))
+            time_scheme = str(data.get('time_scheme', 'backward_euler'))
+            flux_scheme = str(data.get('flux_scheme', 'central'))
+            remesh_every = int(data.get('remesh_every', 5))
             
             # Check for valid ranges
             if dt <= 0:
@@ -526,12 +1055,34 @@ def burgers_equation():
                 return jsonify({'error': 'Viscosity (nu) must be positive'}), 400
             if n_newton_iter < 1:
                 return jsonify({'error': 'Number of Newton iterations must be at least 1'}), 400
+            if newton_tol < 0:
+                return jsonify({'error': 'Newton tolerance (newton_tol) must not be negative'}), 400
+            if time_tol <= 0:
+                return jsonify({'error': 'Time step tolerance (time_tol) must be positive'}), 400
+            if save_every < 0:
+                return jsonify({'error': 'save_every must not be negative'}), 400
+            if save_every and bool(data.get('adaptive_dt', False)):
+                return jsonify({'error': 'save_every requires a fixed time step (adaptive_dt off)'}), 400
+            if save_every and bool(data.get('moving_grid', False)):
+                return jsonify({'error': 'save_every requires a fixed grid (moving_grid off)'}), 400
+            if remesh_every < 1:
+                return jsonify({'error': 'remesh_every must be at least 1'}), 400
+            if 'history_file' in data:
+                return jsonify({'error': 'history_file is only available when calling the solver directly'}), 400
             if num_points < 10:
                 return jsonify({'error': 'Number of points must be at least 10'}), 400
             if x_max <= x_min:
                 return jsonify({'error': 'x_max must be greater than x_min'}), 400
-            if ic_type not in ['step', 'sine']:
-                return jsonify({'error': 'Initial condition type must be either "step" or "sine"'}), 400
+            if ic_type not in ['step', 'sine', 'tanh']:
+                return jsonify({'error': 'Initial condition type must be "step", "sine" or "tanh"'}), 400
+            if ic_type == 'tanh' and left_value <= right_value:
+                return jsonify({'error': 'The "tanh" initial condition needs left_value > right_value'}), 400
+            if time_scheme not in TIME_SCHEMES:
+                return jsonify({'error': f'Time scheme must be one of {", ".join(TIME_SCHEMES)}'}), 400
+            if flux_scheme not in FLUX_SCHEMES:
+                return jsonify({'error': f'Flux scheme must be one of {", ".join(FLUX_SCHEMES)}'}), 400
+            if time_scheme == 'bdf2' and bool(data.get('adaptive_dt', False)):
+                return jsonify({'error': 'BDF2 needs a fixed time step (adaptive_dt off)'}), 400
                 
         except ValueError as e:
             return jsonify({'error': f'Invalid parameter value: {str(e)}'}), 400
@@ -555,5 +1106,64 @@ def burgers_equation():
         print(error_msg)
         return jsonify({'error': error_msg}), 500
 
+@app.route('/api/burgers-equation/ensemble', methods=['POST'])
+def burgers_ensemble():
+    try:
+        data = request.json
+        members = data.get('members', [])
+        print("Received Burgers ensemble request with", len(members) if isinstance(members, list) else 0, "members")
+        
+        required_params = ['dt', 'T', 'n_newton_iter', 'num_points', 'x_min', 'x_max']
+        missing_params = [param for param in required_params if param not in data]
+        if missing_params:
+            return jsonify({'error': f'Missing required parameters: {", ".join(missing_params)}'}), 400
+        if not isinstance(members, list) or not members:
+            return jsonify({'error': 'Members must be a non-empty list of parameter sets'}), 400
+        
+        try:
+            if float(data['dt']) <= 0:
+                return jsonify({'error': 'Time step (dt) must be positive'}), 400
+            if float(data['T']) <= 0:
+                return jsonify({'error': 'Final time (T) must be positive'}), 400
+            if int(data['n_newton_iter']) < 1:
+                return jsonify({'error': 'Number of Newton iterations must be at least 1'}), 400
+            if float(data.get('newton_tol', 1e-10)) < 0:
+                return jsonify({'error': 'Newton tolerance (newton_tol) must not be negative'}), 400
+            if int(data['num_points']) < 10:
+                return jsonify({'error': 'Number of points must be at least 10'}), 400
+            if data.get('flux_scheme', 'central') not in FLUX_SCHEMES:
+                return jsonify({'error': f'Flux scheme must be one of {", ".join(FLUX_SCHEMES)}'}), 400
+            if float(data['x_max']) <= float(data['x_min']):
+                return jsonify({'error': 'x_max must be greater than x_min'}), 400
+            for idx, member in enumerate(members):
+                merged = {**data, **member}
+                if float(merged.get('nu', 0.1)) <= 0:
+                    return jsonify({'error': f'Member {idx}: viscosity (nu) must be positive'}), 400
+                left_value = float(merged.get('left_value', 1.0))
+                right_value = float(merged.get('right_value', 0.0))
+                ic_type = merged.get('ic_type', 'step')
+                if ic_type not in ['step', 'sine', 'tanh']:
+                    return jsonify({'error': f'Member {idx}: initial condition type must be "step", "sine" or "tanh"'}), 400
+                if ic_type == 'tanh' and left_value <= right_value:
+                    return jsonify({'error': f'Member {idx}: the "tanh" initial condition needs left_value > right_value'}), 400
+        except (ValueError, TypeError) as e:
+            return jsonify({'error': f'Invalid parameter value: {str(e)}'}), 400
+        
+        if data.get('adaptive_dt') or data.get('moving_grid') or data.get('save_every') or 'history_file' in data:
+            return jsonify({'error': 'Ensembles support neither adaptive_dt, moving_grid nor history output'}), 400
+        if data.get('time_scheme', 'backward_euler') != 'backward_euler':
+            return jsonify({'error': 'Ensembles only support the backward_euler time scheme'}), 400
+        if data.get('jacobian_reuse'):
+            return jsonify({'error': 'Ensembles refactor every Jacobian; disable jacobian_reuse'}), 400
+        
+        result = simulate_burgers_ensemble(data, members)
+        return jsonify(result)
+    
+    except Exception as e:
+        import traceback
+        error_msg = f"Error in Burgers ensemble solver: {str(e)}\n{traceback.format_exc()}"
+        print(error_msg)
+        return jsonify({'error': error_msg}), 500
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5001, debug=True) 
\ No newline at end of file
@@ -1,43 +1,370 @@
 import numpy as np
+from scipy.linalg import lapack
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')
+import time
 import base64
 from io import BytesIO
+from snapshot_sink import SnapshotSink
+
+# Modified Newton refactors the Jacobian when ||F|| shrinks by less than this per iteration
+JACOBIAN_REUSE_CONTRACTION = 0.1
+
+# Step size controller limits for adaptive time stepping
+ADAPTIVE_SAFETY = 0.9
+ADAPTIVE_MIN_FACTOR = 0.2
+ADAPTIVE_MAX_FACTOR = 2.0
+
+# Implicit time integrators accepted by simulate_burgers
+TIME_SCHEMES = ('backward_euler', 'crank_nicolson', 'bdf2')
+
+# Discretisations of the advective term (u^2/2)_x
+FLUX_SCHEMES = ('central', 'upwind', 'tvd')
+
+# [1, 2, 1] / 4 smoothing passes applied to the moving-grid monitor function
+GRID_SMOOTHING_PASSES = 4
 
 # --------------------------------------------------
-# Thomas Algorithm for a tridiagonal system
+# Tridiagonal Solvers (LAPACK gtsv)
 # --------------------------------------------------
+def solve_tridiagonal(a, b, c, d, overwrite=False):
+    """
+    Solve a tridiagonal system A*x = d with LAPACK's gtsv (Gaussian
+    elimination with partial pivoting, compiled).
+    a, b, c are the lower, main, and upper diagonals, respectively.
+    (Note: a[0] and c[-1] are not used.)
+
+    With overwrite=True the diagonals and d may be used as LAPACK work space
+    and the solution is written into d when it is contiguous float64,
+    so no new arrays are allocated.
+    """
+    _, _, _, x, info = lapack.dgtsv(
+        a[1:], b, c[:-1], d,
+        overwrite_dl=overwrite, overwrite_d=overwrite, overwrite_du=overwrite, overwrite_b=overwrite
+    )
+    if info > 0:
+        raise np.linalg.LinAlgError(f"Singular tridiagonal matrix (zero pivot at row {info})")
+    return x
+
+
 def thomas_solver(a, b, c, d):
     """
-    Solve a tridiagonal system A*x = d using the Thomas algorithm.
+    Solve a tridiagonal system A*x = d.
     a, b, c are the lower, main, and upper diagonals, respectively.
     d is the right-hand side vector.
     (Note: a[0] and c[-1] are not used.)
     """
-    n = len(d)
-    cp = np.zeros(n)  # modified upper diagonal
-    dp = np.zeros(n)  # modified RHS
-    cp[0] = c[0] / b[0]
-    dp[0] = d[0] / b[0]
-    for i in range(1, n):
-        denom = b[i] - a[i] * cp[i - 1]
-        cp[i] = c[i] / denom if i < n - 1 else 0.0
-        dp[i] = (d[i] - a[i] * dp[i - 1]) / denom
-    x = np.zeros(n)
-    x[-1] = dp[-1]
-    for i in range(n - 2, -1, -1):
-        x[i] = dp[i] - cp[i] * x[i + 1]
+    return solve_tridiagonal(
+        np.asarray(a, dtype=float), np.asarray(b, dtype=float),
+        np.asarray(c, dtype=float), np.asarray(d, dtype=float)
+    )
+
+
+def thomas_solver_batched(a, b, c, d):
+    """
+    Solve many independent tridiagonal systems of the same size at once.
+    a, b, c, d have shape (num_systems, n), one system per row, with the
+    same conventions as thomas_solver (a[:, 0] and c[:, -1] are not used).
+
+    The systems are laid end to end as one block-diagonal tridiagonal matrix
+    with zero couplings between blocks, which a single gtsv call solves
+    (pivoting never crosses a zero sub-diagonal entry).
+
+    Returns:
+      x : solutions, shape (num_systems, n)
+    """
+    a = np.asarray(a, dtype=float)
+    d = np.asarray(d, dtype=float)
+    num_systems, n = d.shape
+    lower = a.reshape(-1)[1:].copy()
+    upper = np.asarray(c, dtype=float).reshape(-1)[:-1].copy()
+    lower[n - 1::n] = 0.0
+    upper[n - 1::n] = 0.0
+    x = solve_tridiagonal(
+        np.concatenate([[0.0], lower]), np.asarray(b, dtype=float).reshape(-1),
+        np.concatenate([upper, [0.0]]), d.reshape(-1)
+    )
+    return x.reshape(num_systems, n)
+
+def factor_tridiagonal(a, b, c):
+    """
+    LU-factorize a tridiagonal matrix with LAPACK gttrf so that it can be
+    reused for several right-hand sides (a[0] and c[-1] are not used).
+
+    Returns:
+      factors : tuple passed to solve_factored_tridiagonal
+    """
+    dl, d, du, du2, ipiv, info = lapack.dgttrf(a[1:], b, c[:-1])
+    if info > 0:
+        raise np.linalg.LinAlgError(f"Singular tridiagonal matrix (zero pivot at row {info})")
+    return dl, d, du, du2, ipiv
+
+
+def solve_factored_tridiagonal(factors, d, overwrite=False):
+    """
+    Solve A*x = d with factors from factor_tridiagonal (LAPACK gttrs).
+    """
+    dl, diag, du, du2, ipiv = factors
+    x, info = lapack.dgttrs(dl, diag, du, du2, ipiv, d, overwrite_b=overwrite)
     return x
 
+# --------------------------------------------------
+# Upwind / TVD Advective Fluxes
+# --------------------------------------------------
+def minmod(a, b):
+    """Smaller-magnitude argument where a and b agree in sign, zero elsewhere."""
+    return np.where(a * b > 0, np.sign(a) * np.minimum(np.abs(a), np.abs(b)), 0.0)
+
+
+def control_volume_widths(dx):
+    """
+    Width of the control volume around each interior node: dx itself on a
+    uniform grid, (h_{i-1} + h_i) / 2 when dx is the array of the
+    num_points - 1 node spacings h of a non-uniform grid.
+    """
+    if np.ndim(dx) == 0:
+        return dx
+    return 0.5 * (dx[:-1] + dx[1:])
+
+
+def interface_states(u, flux_scheme, dx=None):
+    """
+    Left and right states at the num_points - 1 interfaces between nodes j and j+1.
+
+    'upwind' uses the node values (first order). 'tvd' adds MUSCL slopes
+    limited with minmod (second order away from extrema); the boundary
+    nodes get zero slope. On a non-uniform grid (dx an array of spacings)
+    the limited slopes are taken from the gradients and scaled by the
+    distance to the interface.
+    """
+    u_left = u[..., :-1]
+    u_right = u[..., 1:]
+    if flux_scheme == 'tvd':
+        jumps = np.diff(u, axis=-1)
+        slope = np.zeros_like(u)
+        if np.ndim(dx) == 0:
+            slope[..., 1:-1] = minmod(jumps[..., :-1], jumps[..., 1:])
+            u_left = u_left + 0.5 * slope[..., :-1]
+            u_right = u_right - 0.5 * slope[..., 1:]
+        else:
+            gradient = jumps / dx
+            slope[..., 1:-1] = minmod(gradient[..., :-1], gradient[..., 1:])
+            u_left = u_left + 0.5 * dx * slope[..., :-1]
+            u_right = u_right - 0.5 * dx * slope[..., 1:]
+    return u_left, u_right
+
+
+def godunov_flux(u_left, u_right):
+    """
+    Exact Riemann (Godunov) flux of f(u) = u^2/2, which for this convex flux is
+    max(max(u_left, 0)^2, min(u_right, 0)^2) / 2.
+
+    Returns:
+      flux         : interface fluxes
+      d_left       : derivative of flux with respect to u_left
+      d_right      : derivative of flux with respect to u_right
+    """
+    left = np.maximum(u_left, 0.0)
+    right = np.minimum(u_right, 0.0)
+    take_left = left**2 >= right**2
+    flux = 0.5 * np.where(take_left, left**2, right**2)
+    return flux, np.where(take_left, left, 0.0), np.where(take_left, 0.0, right)
+
+
+def advective_flux_difference(u, dx, flux_scheme, out):
+    """
+    Write (f_{i+1/2} - f_{i-1/2}) / dx for the interior nodes into out using
+    Godunov fluxes of the 'upwind' or 'tvd' interface states (dx may be an
+    array of spacings, see control_volume_widths).
+    """
+    flux, _, _ = godunov_flux(*interface_states(u, flux_scheme, dx))
+    np.subtract(flux[..., 1:], flux[..., :-1], out=out)
+    out /= control_volume_widths(dx)
+    return out
+
+# --------------------------------------------------
+# Work Buffers, Residual and Jacobian
+# --------------------------------------------------
+def allocate_newton_workspace(num_points, num_members=None):
+    """
+    Allocate the buffers reused by newton_step across iterations and time steps.
+
+    Returns a dict with the Newton iterate 'u', the interior residual 'F',
+    the Jacobian diagonals 'a', 'b', 'c', the solve right-hand side 'rhs',
+    scratch arrays, the factored Jacobian kept for reuse, a running count of
+    Jacobian evaluations and whether the last newton_step converged.
+
+    With num_members set, every buffer gets a leading member axis for
+    newton_step_ensemble.
+    """
+    lead = () if num_members is None else (num_members,)
+    full = lead + (num_points,)
+    interior = lead + (num_points - 2,)
+    return {
+        'u': np.zeros(full),
+        'u_sq': np.zeros(full),
+        'F': np.zeros(interior),
+        'scratch': np.zeros(interior),
+        'a': np.zeros(interior),
+        'b': np.zeros(interior),
+        'c': np.zeros(interior),
+        'rhs': np.zeros(interior),
+        'jacobian_factor': None,
+        'jacobian_dt': None,
+        'jacobian_evaluations': 0,
+        'converged': True
+    }
+
+
+def compute_residual(u, u_old, dt, dx, nu, work, flux_scheme='central'):
+    """
+    Evaluate the interior residual
+       F_i = (u_i - u_old_i) + dt * (u_{i+1}^2 - u_{i-1}^2) / (4 dx)
+             - dt * nu * (u_{i+1} - 2 u_i + u_{i-1}) / dx^2
+    into work['F'] using whole-array operations. With flux_scheme 'upwind'
+    or 'tvd' the centred advective term is replaced by the conservative
+    difference dt * (f_{i+1/2} - f_{i-1/2}) / dx of Godunov fluxes.
+
+    u and u_old may carry a leading member axis (one state per row); nu is
+    then a scalar or a column of shape (num_members, 1). An array dx of node
+    spacings selects compute_residual_nonuniform.
+    """
+    if np.ndim(dx) > 0:
+        return compute_residual_nonuniform(u, u_old, dt, dx, nu, work, flux_scheme)
+    F = work['F']
+    diffusion = work['scratch']
+    u_sq = work['u_sq']
+
+    if flux_scheme == 'central':
+        np.multiply(u, u, out=u_sq)
+        np.subtract(u_sq[..., 2:], u_sq[..., :-2], out=F)
+        F *= dt / (4 * dx)
+    else:
+        advective_flux_difference(u, dx, flux_scheme, F)
+        F *= dt
+
+    np.subtract(u[..., 2:], u[..., 1:-1], out=diffusion)
+    diffusion -= u[..., 1:-1]
+    diffusion += u[..., :-2]
+    diffusion *= dt * nu / (dx**2)
+
+    F -= diffusion
+    F += u[..., 1:-1]
+    F -= u_old[..., 1:-1]
+    return F
+
+
+def compute_jacobian(u, dt, dx, nu, work, flux_scheme='central'):
+    """
+    Fill the tridiagonal Jacobian of compute_residual into work['a'], work['b'],
+    work['c'] (sub-, main and super-diagonal over the interior nodes).
+    a[0] and c[-1] are unused and set to zero. Member axes are handled as in
+    compute_residual.
+
+    The 'upwind' Jacobian is exact. The limited 'tvd' fluxes couple five
+    nodes, so 'tvd' uses the first-order upwind Jacobian instead, which keeps
+    the tridiagonal solve at the price of linear Newton convergence.
+    """
+    if np.ndim(dx) > 0:
+        return compute_jacobian_nonuniform(u, dt, dx, nu, work, flux_scheme)
+    a, b_diag, c = work['a'], work['b'], work['c']
+    advection = dt / (2 * dx)
+    diffusion = nu * dt / (dx**2)
+
+    if flux_scheme == 'central':
+        a[..., 0] = 0.0
+        np.multiply(u[..., 1:-2], -advection, out=a[..., 1:])
+        a[..., 1:] -= diffusion
+
+        b_diag[...] = 1 + 2 * diffusion
+
+        np.multiply(u[..., 2:-1], advection, out=c[..., :-1])
+        c[..., :-1] -= diffusion
+        c[..., -1] = 0.0
+        return a, b_diag, c
+
+    # dF_i/du_{i-1} = -d_left_{i-1/2}, dF_i/du_i = d_left_{i+1/2} - d_right_{i-1/2},
+    # dF_i/du_{i+1} = d_right_{i+1/2}, all times dt / dx
+    _, d_left, d_right = godunov_flux(u[..., :-1], u[..., 1:])
+    a[..., 0] = 0.0
+    np.multiply(d_left[..., 1:-1], -dt / dx, out=a[..., 1:])
+    a[..., 1:] -= diffusion
+
+    np.subtract(d_left[..., 1:], d_right[..., :-1], out=b_diag)
+    b_diag *= dt / dx
+    b_diag += 1 + 2 * diffusion
+
+    np.multiply(d_right[..., 1:-1], dt / dx, out=c[..., :-1])
+    c[..., :-1] -= diffusion
+    c[..., -1] = 0.0
+    return a, b_diag, c
+
+def compute_residual_nonuniform(u, u_old, dt, h, nu, work, flux_scheme='central'):
+    """
+    compute_residual on a non-uniform grid with node spacings h (length
+    num_points - 1). With control volumes of width w_i = (h_{i-1} + h_i) / 2,
+       F_i = (u_i - u_old_i) + dt * (u_{i+1}^2 - u_{i-1}^2) / (4 w_i)
+             - dt * nu * ((u_{i+1} - u_i) / h_i - (u_i - u_{i-1}) / h_{i-1}) / w_i,
+    which reduces to the uniform residual when all h_i are equal.
+    """
+    F = work['F']
+    diffusion = work['scratch']
+    width = control_volume_widths(h)
+
+    if flux_scheme == 'central':
+        np.subtract(u[..., 2:]**2, u[..., :-2]**2, out=F)
+        F /= 4 * width
+    else:
+        advective_flux_difference(u, h, flux_scheme, F)
+    F *= dt
+
+    gradient = np.diff(u, axis=-1) / h
+    np.subtract(gradient[..., 1:], gradient[..., :-1], out=diffusion)
+    diffusion *= dt * nu / width
+
+    F -= diffusion
+    F += u[..., 1:-1]
+    F -= u_old[..., 1:-1]
+    return F
+
+
+def compute_jacobian_nonuniform(u, dt, h, nu, work, flux_scheme='central'):
+    """
+    Tridiagonal Jacobian of compute_residual_nonuniform, filled into work
+    like compute_jacobian (with the same upwind approximation for 'tvd').
+    """
+    a, b_diag, c = work['a'], work['b'], work['c']
+    width = control_volume_widths(h)
+    diffusion_lower = dt * nu / (h[:-1] * width)
+    diffusion_upper = dt * nu / (h[1:] * width)
+
+    if flux_scheme == 'central':
+        advection_lower = -0.5 * u[..., 1:-2]
+        advection_diag = 0.0
+        advection_upper = 0.5 * u[..., 2:-1]
+    else:
+        _, d_left, d_right = godunov_flux(u[..., :-1], u[..., 1:])
+        advection_lower = -d_left[..., 1:-1]
+        advection_diag = d_left[..., 1:] - d_right[..., :-1]
+        advection_upper = d_right[..., 1:-1]
+
+    a[..., 0] = 0.0
+    a[..., 1:] = advection_lower * dt / width[1:] - diffusion_lower[1:]
+    b_diag[...] = 1 + advection_diag * dt / width + diffusion_lower + diffusion_upper
+    c[..., :-1] = advection_upper * dt / width[:-1] - diffusion_upper[:-1]
+    c[..., -1] = 0.0
+    return a, b_diag, c
+
 # --------------------------------------------------
 # One Newton Solve for the Implicit Time Step
 # (Matching the equation: J Δu = -F, then u <- u + Δu)
 # --------------------------------------------------
-def newton_step(u_old, dt, dx, nu, left_value, right_value, n_iter=7):
+def newton_step(u_old, dt, dx, nu, left_value, right_value, n_iter=7, work=None,
+                tol=None, reuse_jacobian=False, guess=None, flux_scheme='central'):
     """
     Given u_old (the solution at time level n) and time step dt,
-    perform a fixed number (n_iter) of Newton iterations to solve:
+    perform up to n_iter Newton iterations to solve:
        u - u_old + dt * [(u^2/2)_x - nu * u_xx] = 0
     using centered differences in space.
 
@@ -45,59 +372,268 @@ def newton_step(u_old, dt, dx, nu, left_value, right_value, n_iter=7):
        [a_{i} Δu_{i-1} + b_{i} Δu_i + c_{i} Δu_{i+1}] = -F_i,
     so we solve J Δu = -F and then update u <- u + Δu.
 
+    With tol set, iteration stops once ||F|| <= tol or
+    ||Δu|| <= tol * (1 + ||u||); otherwise exactly n_iter iterations are run.
+    With reuse_jacobian, the factored Jacobian (kept in work) is reused
+    across iterations and time steps (modified Newton) and only rebuilt when
+    the residual stops contracting by JACOBIAN_REUSE_CONTRACTION per
+    iteration or dt changes.
+
+    flux_scheme selects the advective discretisation (see FLUX_SCHEMES and
+    compute_residual).
+
+    Other implicit schemes reuse this solve by passing their explicit part
+    as u_old and a scaled dt (see implicit_scheme_rhs); guess then supplies
+    the starting iterate, which defaults to u_old.
+
+    work is an optional dict from allocate_newton_workspace. When given, the
+    residual and Jacobian are built in its buffers and the returned u is
+    work['u'], which the next call overwrites. work['converged'] records
+    whether the tolerance was met.
+
     Returns:
       u              : updated solution at the new time level
       diag_history   : list of (||F||, ||Δu||) for each Newton iteration
       n_iter         : number of Newton iterations performed
     """
-    u = u_old.copy()  # initial guess
-    N = len(u)
+    if work is None:
+        work = allocate_newton_workspace(len(u_old))
+    u = work['u']
+    np.copyto(u, u_old if guess is None else guess)  # initial guess
     diag_history = []
+    converged = tol is None
+    if work['jacobian_dt'] != dt:
+        work['jacobian_factor'] = None
+    prev_normF = None
 
     for it in range(n_iter):
-        # Build the residual F(u)
-        F = np.zeros(N)
-        for i in range(1, N - 1):
-            flux_diff = (u[i + 1]**2 - u[i - 1]**2) / (4 * dx)
-            diff_term = (u[i + 1] - 2*u[i] + u[i - 1]) / (dx**2)
-            F[i] = (u[i] - u_old[i]) + dt * flux_diff - dt * nu * diff_term
-
-        # Compute the residual norm on the interior nodes
-        F_int = F[1:N-1]
+        # Build the residual F(u) and its norm on the interior nodes
+        F_int = compute_residual(u, u_old, dt, dx, nu, work, flux_scheme)
         normF = np.linalg.norm(F_int, 2)
+        if tol is not None and normF <= tol:
+            converged = True
+            break
+        np.negative(F_int, out=work['rhs'])
+
+        if reuse_jacobian:
+            # Modified Newton: refactor only when convergence slows down
+            slow = prev_normF is not None and normF > JACOBIAN_REUSE_CONTRACTION * prev_normF
+            if work['jacobian_factor'] is None or slow:
+                a, b_diag, c = compute_jacobian(u, dt, dx, nu, work, flux_scheme)
+                work['jacobian_factor'] = factor_tridiagonal(a, b_diag, c)
+                work['jacobian_dt'] = dt
+                work['jacobian_evaluations'] += 1
+            delta = solve_factored_tridiagonal(work['jacobian_factor'], work['rhs'], overwrite=True)
+        else:
+            # Build the tridiagonal Jacobian (for interior nodes) and solve
+            # J Δu = -F_int in place (the buffers are rebuilt next iteration)
+            a, b_diag, c = compute_jacobian(u, dt, dx, nu, work, flux_scheme)
+            work['jacobian_evaluations'] += 1
+            delta = solve_tridiagonal(a, b_diag, c, work['rhs'], overwrite=True)
 
-        # Build the tridiagonal Jacobian (for interior nodes)
-        n_int = N - 2
-        a = np.zeros(n_int)      # sub-diagonal
-        b_diag = np.zeros(n_int) # main diagonal
-        c = np.zeros(n_int)      # super-diagonal
-
-        # i = 1 (first interior node)
-        i = 1
-        b_diag[0] = 1 + 2 * nu * dt / (dx**2)
-        c[0] = dt * (u[i+1] / (2 * dx)) - nu * dt / (dx**2)
-
-        # i = 2,...,N-3 (middle interior nodes)
-        for k in range(1, n_int-1):
-            i = k + 1
-            a[k] = -dt * (u[i-1] / (2 * dx)) - nu * dt / (dx**2)
-            b_diag[k] = 1 + 2 * nu * dt / (dx**2)
-            c[k] = dt * (u[i+1] / (2 * dx)) - nu * dt / (dx**2)
-
-        # i = N-2 (last interior node)
-        i = N - 2
-        a[-1] = -dt * (u[i-1] / (2 * dx)) - nu * dt / (dx**2)
-        b_diag[-1] = 1 + 2 * nu * dt / (dx**2)
-
-        # Solve J Δu = -F_int using the Thomas algorithm
-        delta = thomas_solver(a, b_diag, c, -F_int)
         norm_delta = np.linalg.norm(delta, 2)
         diag_history.append((normF, norm_delta))
 
         # Update: u <- u + delta (on interior nodes only)
-        u[1:N-1] += delta
+        u[1:-1] += delta
+        prev_normF = normF
+
+        if tol is not None and norm_delta <= tol * (1 + np.linalg.norm(u, 2)):
+            converged = True
+            break
+
+    work['converged'] = converged
+    return u, diag_history, len(diag_history)
+
+def spatial_operator(u, dx, nu, out, flux_scheme='central'):
+    """
+    Evaluate the centred spatial operator
+       N_i(u) = (u_{i+1}^2 - u_{i-1}^2) / (4 dx) - nu * (u_{i+1} - 2 u_i + u_{i-1}) / dx^2
+    on the interior nodes into out, so that backward Euler reads
+    u - u_old + dt * N(u) = 0. Other flux schemes replace the advective
+    term as in compute_residual; an array dx uses the non-uniform form of
+    compute_residual_nonuniform.
+    """
+    if np.ndim(dx) > 0:
+        if flux_scheme == 'central':
+            np.subtract(u[..., 2:]**2, u[..., :-2]**2, out=out)
+            out /= 4 * control_volume_widths(dx)
+        else:
+            advective_flux_difference(u, dx, flux_scheme, out)
+        gradient = np.diff(u, axis=-1) / dx
+        out -= nu * (gradient[..., 1:] - gradient[..., :-1]) / control_volume_widths(dx)
+        return out
+    if flux_scheme == 'central':
+        np.subtract(u[..., 2:]**2, u[..., :-2]**2, out=out)
+        out /= 4 * dx
+    else:
+        advective_flux_difference(u, dx, flux_scheme, out)
+    out -= nu * (u[..., 2:] - 2 * u[..., 1:-1] + u[..., :-2]) / dx**2
+    return out
+
+
+def implicit_scheme_rhs(scheme, u_n, dt, dx, nu, out, u_prev=None, flux_scheme='central'):
+    """
+    Write a one-step implicit scheme as u - r + beta * dt * N(u) = 0, the
+    backward-Euler residual with u_old = r and dt scaled by beta:
+      backward_euler : r = u^n,                          beta = 1
+      crank_nicolson : r = u^n - dt/2 * N(u^n),          beta = 1/2
+      bdf2           : r = (4 u^n - u^{n-1}) / 3,        beta = 2/3
+    BDF2 needs u_prev (u^{n-1}, same constant dt) and falls back to backward
+    Euler without it. Boundary entries of out are copied from u_n.
+
+    Returns:
+      beta : factor applied to dt in the Newton solve
+    """
+    np.copyto(out, u_n)
+    if scheme == 'crank_nicolson':
+        out[1:-1] -= 0.5 * dt * spatial_operator(u_n, dx, nu, np.empty(len(u_n) - 2), flux_scheme)
+        return 0.5
+    if scheme == 'bdf2' and u_prev is not None:
+        out[1:-1] *= 4.0
+        out[1:-1] -= u_prev[1:-1]
+        out[1:-1] /= 3.0
+        return 2.0 / 3.0
+    return 1.0
+
+
+def newton_step_ensemble(u_old, dt, dx, nu, n_iter=7, work=None, tol=None, flux_scheme='central'):
+    """
+    newton_step for many independent states advanced in lockstep.
+
+    u_old has shape (num_members, num_points) with each row's Dirichlet values
+    already in place; nu is a scalar or a (num_members, 1) column. Residuals
+    and Jacobians are evaluated for all members at once and the tridiagonal
+    systems of the members still iterating are solved in one batched call.
+    A member stops iterating as soon as it meets the tolerance (same tests as
+    newton_step), so each row gets the same iterates it would get on its own.
+
+    work is an optional dict from allocate_newton_workspace(num_points,
+    num_members); the returned u is work['u'].
+
+    Returns:
+      u              : updated solutions, shape (num_members, num_points)
+      diag_history   : per member, list of (||F||, ||Δu||) for each iteration
+      iterations     : number of Newton iterations performed per member
+      converged      : boolean array, whether each member met the tolerance
+    """
+    num_members, num_points = u_old.shape
+    if work is None:
+        work = allocate_newton_workspace(num_points, num_members)
+    u = work['u']
+    np.copyto(u, u_old)  # initial guess
+    diag_history = [[] for _ in range(num_members)]
+    iterations = np.zeros(num_members, dtype=int)
+    converged = np.full(num_members, tol is None)
+    active = np.ones(num_members, dtype=bool)
+
+    for it in range(n_iter):
+        F = compute_residual(u, u_old, dt, dx, nu, work, flux_scheme)
+        normF = np.linalg.norm(F, 2, axis=-1)
+        if tol is not None:
+            done = active & (normF <= tol)
+            converged |= done
+            active &= ~done
+        rows = np.flatnonzero(active)
+        if len(rows) == 0:
+            break
+
+        a, b_diag, c = compute_jacobian(u, dt, dx, nu, work, flux_scheme)
+        work['jacobian_evaluations'] += len(rows)
+        np.negative(F, out=work['rhs'])
+        delta = thomas_solver_batched(a[rows], b_diag[rows], c[rows], work['rhs'][rows])
+
+        norm_delta = np.linalg.norm(delta, 2, axis=-1)
+        for row, norm_f, norm_d in zip(rows, normF[rows], norm_delta):
+            diag_history[row].append((norm_f, norm_d))
+
+        u[rows, 1:-1] += delta
+        iterations[rows] += 1
+
+        if tol is not None:
+            done = norm_delta <= tol * (1 + np.linalg.norm(u[rows], 2, axis=-1))
+            converged[rows[done]] = True
+            active[rows[done]] = False
+
+    work['converged'] = bool(converged.all())
+    return u, diag_history, iterations, converged
+
+
+def initial_condition(x, ic_type, left_value, right_value, nu=None):
+    """
+    Initial state on the grid x: 'step' (left_value for x <= 0, right_value
+    beyond), 'sine' (a half sine wave between the two values) or 'tanh' (the
+    travelling front of exact_solution at t = 0, which needs nu and
+    left_value > right_value). Unknown types fall back to 'step'.
+    """
+    if ic_type == 'tanh':
+        u = exact_solution(x, 0.0, nu, left_value, right_value)
+        if u is None:
+            raise ValueError("ic_type 'tanh' needs left_value > right_value")
+        return u
+    if ic_type == 'sine':
+        x_min, x_max = x[0], x[-1]
+        return 0.5 * (left_value + right_value) + 0.5 * (left_value - right_value) * np.sin(np.pi * (x - x_min) / (x_max - x_min))
+    return np.where(x <= 0, left_value, right_value)
+
+def exact_solution(x, t, nu, left_value, right_value):
+    """
+    Travelling-front solution of the viscous Burgers equation,
+       u = u_R + (u_L - u_R) / 2 * (1 - tanh((u_L - u_R) (x - s t) / (4 nu))),
+    with speed s = (u_L + u_R) / 2, which for the standard values (1, 0) is
+    0.5 - 0.5 tanh((x - t/2) / (4 nu)). It only exists for u_L > u_R;
+    None is returned otherwise. It is exact for ic_type 'tanh' and the
+    long-time limit of a step.
+    """
+    if left_value <= right_value:
+        return None
+    jump = left_value - right_value
+    speed = 0.5 * (left_value + right_value)
+    return right_value + 0.5 * jump * (1 - np.tanh(jump * (x - speed * t) / (4 * nu)))
+
+def equidistribute_grid(x, u, smoothing_passes=GRID_SMOOTHING_PASSES):
+    """
+    Move the nodes of x (same count, same end points) so that they
+    equidistribute the scaled arc-length monitor
+       w = sqrt(1 + (L u_x / U)^2),
+    with L the domain length and U the range of u. The front then weighs about
+    as much as the rest of the domain, so roughly half of the nodes gather
+    where u varies while the spacing elsewhere stays within about twice the
+    uniform one. The monitor is smoothed so that neighbouring spacings only
+    change gradually.
 
-    return u, diag_history, n_iter
+    Returns:
+      new_x : node positions, increasing, with new_x[0] = x[0] and new_x[-1] = x[-1]
+    """
+    h = np.diff(x)
+    span = max(np.ptp(u), 1e-12)
+    monitor = np.sqrt(1 + ((x[-1] - x[0]) * np.diff(u) / (h * span))**2)
+    for _ in range(smoothing_passes):
+        monitor[1:-1] = 0.25 * monitor[:-2] + 0.5 * monitor[1:-1] + 0.25 * monitor[2:]
+    cumulative = np.concatenate([[0.0], np.cumsum(monitor * h)])
+    new_x = np.interp(np.linspace(0.0, cumulative[-1], len(x)), cumulative, x)
+    new_x[0], new_x[-1] = x[0], x[-1]
+    return new_x
+
+def remap_conservative(x, u, new_x):
+    """
+    Interpolate u from the nodes x onto new_x while keeping its integral
+    (trapezoidal rule) unchanged. Plain interpolation loses a little mass at
+    the front on every remesh, and for a travelling front the mass sets the
+    front position, so the error would build up as a phase lag. The mass
+    defect is put back with weights |u_x|, i.e. at the front only; the end
+    points (boundary values) are left untouched.
+    """
+    new_u = np.interp(new_x, x, u)
+    weight = np.abs(np.gradient(new_u, new_x))
+    weight[0] = weight[-1] = 0.0
+    new_h = np.diff(new_x)
+    weight_integral = np.sum(0.5 * new_h * (weight[:-1] + weight[1:]))
+    if weight_integral > 0:
+        defect = (np.sum(0.5 * np.diff(x) * (u[:-1] + u[1:]))
+                  - np.sum(0.5 * new_h * (new_u[:-1] + new_u[1:])))
+        new_u += defect / weight_integral * weight
+    return new_u
 
 # --------------------------------------------------
 # Time Integration Function
@@ -105,102 +641,284 @@ def newton_step(u_old, dt, dx, nu, left_value, right_value, n_iter=7):
 def simulate_burgers(params):
     """
     Simulate the viscous Burgers equation from t=0 to t=T using
-    an implicit backward-Euler time step and a fixed number of
-    Newton iterations per time step.
+    an implicit time step (backward Euler, Crank-Nicolson or BDF2) and
+    Newton iterations per time step, stopped by a tolerance or an iteration cap.
     
     Parameters:
     - params: Dictionary containing simulation parameters
         - dt: time step
         - T: final time
+        - time_scheme: 'backward_euler' (first order, default), 'crank_nicolson'
+          or 'bdf2' (second order; BDF2 starts with one backward-Euler step)
+        - flux_scheme: advective discretisation, 'central' (default), 'upwind'
+          (first-order Godunov) or 'tvd' (MUSCL with minmod limiter); the last
+          two stay free of oscillations at shocks when nu is small relative to dx
         - nu: viscosity coefficient
-        - n_newton_iter: number of Newton iterations per time step
+        - n_newton_iter: maximum number of Newton iterations per time step
+        - newton_tol: stop Newton once ||F|| or the relative ||Δu|| is below
+          this (0 runs exactly n_newton_iter iterations)
+        - jacobian_reuse: reuse the factored Jacobian across iterations and
+          time steps until convergence slows (modified Newton); a new step
+          size forces a refactorization, so with adaptive_dt it only carries
+          over between the two half steps of each step-doubling pair
+        - adaptive_dt: control dt from a step-doubling error estimate and Newton
+          convergence; dt is then only the initial step and output times are
+          hit exactly
+        - time_tol: local error tolerance, relative to 1 + |u|, for adaptive_dt
+        - dt_min: smallest step adaptive_dt may take before giving up
+        - moving_grid: keep num_points nodes but cluster them at the front by
+          equidistributing an arc-length monitor (see equidistribute_grid)
+        - remesh_every: with moving_grid, redistribute the nodes every this
+          many accepted steps and interpolate the solution onto them
+        - save_every: also record every k-th time step in a preallocated
+          history (0 keeps only the plotted output times)
+        - history_file: write the history to this memory-mapped .npy file
+          instead of RAM (implies save_every=1 unless given)
         - x_min: left boundary of domain
         - x_max: right boundary of domain
         - num_points: number of grid points
         - left_value: Dirichlet BC at left boundary
         - right_value: Dirichlet BC at right boundary
-        - ic_type: initial condition type ('step' or 'sine')
+        - ic_type: initial condition type ('step', 'sine' or 'tanh')
     
     Returns:
-      Dictionary with simulation results and plots
+      Dictionary with simulation results and plots; the statistics include
+      the L2 and max error against exact_solution when one exists
     """
     # Extract parameters
     dt = float(params.get('dt', 0.5))
     T = float(params.get('T', 20.0))
     nu = float(params.get('nu', 0.1))
+    time_scheme = params.get('time_scheme', 'backward_euler')
+    flux_scheme = params.get('flux_scheme', 'central')
     n_newton_iter = int(params.get('n_newton_iter', 7))
+    newton_tol = float(params.get('newton_tol', 1e-10))
+    jacobian_reuse = bool(params.get('jacobian_reuse', False))
+    adaptive_dt = bool(params.get('adaptive_dt', False))
+    time_tol = float(params.get('time_tol', 1e-3))
+    dt_min = float(params.get('dt_min', 1e-8 * T))
     x_min = float(params.get('x_min', -10))
     x_max = float(params.get('x_max', 30))
     num_points = int(params.get('num_points', 501))
     left_value = float(params.get('left_value', 1.0))
     right_value = float(params.get('right_value', 0.0))
     ic_type = params.get('ic_type', 'step')
+    moving_grid = bool(params.get('moving_grid', False))
+    remesh_every = int(params.get('remesh_every', 5))
+    history_file = params.get('history_file')
+    save_every = int(params.get('save_every', 1 if history_file else 0))
+
+    if time_scheme not in TIME_SCHEMES:
+        raise ValueError(f"Unknown time_scheme: {time_scheme}. Choose one of {', '.join(TIME_SCHEMES)}")
+    if flux_scheme not in FLUX_SCHEMES:
+        raise ValueError(f"Unknown flux_scheme: {flux_scheme}. Choose one of {', '.join(FLUX_SCHEMES)}")
+    if time_scheme == 'bdf2' and adaptive_dt:
+        raise ValueError("BDF2 needs a constant time step; use crank_nicolson with adaptive_dt")
+    if save_every < 0:
+        raise ValueError("save_every must not be negative")
+    if save_every and adaptive_dt:
+        raise ValueError("save_every/history_file need a fixed time step; disable adaptive_dt")
+    if save_every and moving_grid:
+        raise ValueError("save_every/history_file need a fixed grid; disable moving_grid")
+    if remesh_every < 1:
+        raise ValueError("remesh_every must be at least 1")
     
     # Set up spatial grid
     x = np.linspace(x_min, x_max, num_points)
     dx = x[1] - x[0]
 
     # Initial condition
-    if ic_type == 'step':
-        u = np.where(x <= 0, left_value, right_value)
-    elif ic_type == 'sine':
-        u = 0.5 * (left_value + right_value) + 0.5 * (left_value - right_value) * np.sin(np.pi * (x - x_min) / (x_max - x_min))
-    else:  # Default to step
-        u = np.where(x <= 0, left_value, right_value)
+    u = initial_condition(x, ic_type, left_value, right_value, nu)
+
+    if moving_grid:
+        # dx becomes the array of node spacings, updated in place on remeshing.
+        # Two passes let the nodes find a front the uniform grid under-resolves.
+        for _ in range(2):
+            x = equidistribute_grid(x, u)
+            u = initial_condition(x, ic_type, left_value, right_value, nu)
+        dx = np.diff(x)
     
-    u_all = [u.copy()]
-    times = [0.0]
+    # Only the plotted output times are kept; memory does not grow with n_steps
+    save_times = [0.0, T/4, T/2, 3*T/4, T]
+    snapshots = SnapshotSink(len(save_times), num_points)
+    grid_snapshots = SnapshotSink(len(save_times), num_points)
+    snapshots.append(0.0, u)
+    grid_snapshots.append(0.0, x)
 
-    n_steps = int(T / dt)
-    t = 0.0
-    newton_history_all = []
+    # Buffers reused by every Newton iteration of every time step
+    work = allocate_newton_workspace(num_points)
+    u_old = np.empty(num_points)
+    u_start_bc = np.empty(num_points)
+    # A non-positive tolerance runs all n_newton_iter iterations
+    stop_tol = newton_tol if newton_tol > 0 else None
 
-    # Store solutions at specific time points for visualization
-    save_times = [0.0, T/4, T/2, 3*T/4, T]
-    save_indices = [0]
-    next_save_idx = 1
+    newton_history_all = []
+    total_newton_iterations = 0
+    max_newton_iterations = 0
+    unconverged_steps = 0
 
-    for n in range(n_steps):
-        u_old = u.copy()
+    def implicit_step(u_start, step_dt, out, u_prev=None):
+        """Advance u_start by step_dt into out; return (history, iterations, converged)."""
+        np.copyto(u_start_bc, u_start)
         # Enforce Dirichlet BCs
-        u_old[0] = left_value
-        u_old[-1] = right_value
+        u_start_bc[0] = left_value
+        u_start_bc[-1] = right_value
+        beta = implicit_scheme_rhs(time_scheme, u_start_bc, step_dt, dx, nu, u_old, u_prev, flux_scheme)
 
         # Perform Newton iterations for this time step
-        u, newton_history, n_newton = newton_step(
-            u_old, dt, dx, nu, left_value, right_value, n_iter=n_newton_iter
+        u_new, newton_history, n_newton = newton_step(
+            u_old, beta * step_dt, dx, nu, left_value, right_value, n_iter=n_newton_iter, work=work,
+            tol=stop_tol, reuse_jacobian=jacobian_reuse, guess=u_start_bc, flux_scheme=flux_scheme
         )
-        
+
         # Re-apply boundary conditions
-        u[0] = left_value
-        u[-1] = right_value
+        np.copyto(out, u_new)
+        out[0] = left_value
+        out[-1] = right_value
+        return newton_history, n_newton, work['converged']
 
-        t += dt
-        times.append(t)
-        
-        if n == 0:
-            newton_history_all = newton_history
+    def remesh(*states):
+        """Move the nodes to the current solution and interpolate states (None skipped) onto them."""
+        new_x = equidistribute_grid(x, u)
+        for state in states:
+            if state is not None:
+                state[:] = remap_conservative(x, state, new_x)
+        x[:] = new_x
+        dx[:] = np.diff(x)
+        # A factored Jacobian belongs to the old grid
+        work['jacobian_factor'] = None
 
-        # Save solution at specific times
-        if next_save_idx < len(save_times) and t >= save_times[next_save_idx]:
-            save_indices.append(len(u_all))
-            next_save_idx += 1
-            
-        u_all.append(u.copy())
+    next_save_idx = 1
+    remeshes = 0
+    accepted_steps = 0
+    rejected_steps = 0
+
+    if not adaptive_dt:
+        n_steps = int(T / dt)
+        history = None
+        if save_every:
+            history = SnapshotSink(n_steps // save_every + 1, num_points, path=history_file)
+            history.append(0.0, u)
+        # BDF2 also needs the state one step back
+        u_prev = np.empty(num_points) if time_scheme == 'bdf2' else None
+        t = 0.0
+        for n in range(n_steps):
+            newton_history, n_newton, converged = implicit_step(u, dt, u, u_prev if n > 0 else None)
+            if u_prev is not None:
+                np.copyto(u_prev, u_start_bc)
+            total_newton_iterations += n_newton
+            max_newton_iterations = max(max_newton_iterations, n_newton)
+            if not converged:
+                unconverged_steps += 1
+
+            t += dt
+
+            if n == 0:
+                newton_history_all = newton_history
+
+            # Save solution at specific times
+            if next_save_idx < len(save_times) and t >= save_times[next_save_idx]:
+                snapshots.append(t, u)
+                grid_snapshots.append(t, x)
+                next_save_idx += 1
+
+            if history is not None and (n + 1) % save_every == 0:
+                history.append(t, u)
+
+            if moving_grid and (n + 1) % remesh_every == 0 and n + 1 < n_steps:
+                remesh(u, u_prev)
+                remeshes += 1
+        accepted_steps = n_steps
+    else:
+        # Step doubling: compare one step of size h with two steps of size h/2.
+        # A scheme of order p has local error O(h^(p+1)), so the difference
+        # estimates it; backward Euler accepts the Richardson-extrapolated
+        # combination.
+        order = 2 if time_scheme == 'crank_nicolson' else 1
+        u_full = np.empty(num_points)
+        u_half = np.empty(num_points)
+        t = 0.0
+        step_dt = dt
+        while next_save_idx < len(save_times):
+            # Shorten the step so that it lands exactly on the next output time
+            target = save_times[next_save_idx]
+            h = min(step_dt, target - t)
+            clipped = h < step_dt
+
+            history, n_full, ok_full = implicit_step(u, h, u_full)
+            _, n_half1, ok_half1 = implicit_step(u, h / 2, u_half)
+            _, n_half2, ok_half2 = implicit_step(u_half, h / 2, u_half)
+            n_newton = n_full + n_half1 + n_half2
+
+            scale = time_tol * (1 + np.abs(u_half))
+            error = np.max(np.abs(u_half - u_full) / scale)
+            if not (ok_full and ok_half1 and ok_half2):
+                # Newton failed to converge: treat as a rejected step and shrink hard
+                error = np.inf
+                factor = ADAPTIVE_MIN_FACTOR
+            else:
+                factor = ADAPTIVE_SAFETY * max(error, 1e-16) ** (-1.0 / (order + 1))
+                factor = min(ADAPTIVE_MAX_FACTOR, max(ADAPTIVE_MIN_FACTOR, factor))
+                # Do not grow dt while Newton is close to its iteration cap
+                if max(n_full, n_half1, n_half2) > 0.75 * n_newton_iter:
+                    factor = min(factor, 1.0)
+
+            if error <= 1.0:
+                if time_scheme == 'crank_nicolson':
+                    # Crank-Nicolson does not damp stiff modes (amplification
+                    # near -1), which extrapolation would amplify further
+                    np.copyto(u, u_half)
+                else:
+                    # Richardson extrapolation of the two estimates (second order)
+                    np.multiply(u_half, 2.0, out=u)
+                    u -= u_full
+                t = target if clipped else t + h
+                accepted_steps += 1
+                total_newton_iterations += n_newton
+                max_newton_iterations = max(max_newton_iterations, n_newton)
+                if accepted_steps == 1:
+                    newton_history_all = history
+
+                if np.isclose(t, target, rtol=0, atol=1e-12 * max(T, 1.0)):
+                    t = target
+                    snapshots.append(t, u)
+                    grid_snapshots.append(t, x)
+                    next_save_idx += 1
+
+                if moving_grid and accepted_steps % remesh_every == 0 and next_save_idx < len(save_times):
+                    remesh(u)
+                    remeshes += 1
+
+                # A step shortened to hit an output time says little about the
+                # controller's step size, so only let it shrink dt
+                step_dt = min(step_dt, h * factor) if clipped else h * factor
+            else:
+                rejected_steps += 1
+                step_dt = h * factor
+
+            if step_dt < dt_min:
+                raise RuntimeError(f"Adaptive time step fell below dt_min={dt_min} at t={t}")
+        n_steps = accepted_steps
 
     # Calculate exact solution for comparison (if using standard parameters)
-    if left_value == 1.0 and right_value == 0.0:
-        u_exact = 0.5 - 0.5 * np.tanh((x - 0.5 * T) / (4 * nu))
+    u_exact = exact_solution(x, T, nu, left_value, right_value)
+    if u_exact is not None:
+        error = u - u_exact
+        if moving_grid:
+            # Trapezoidal rule on the non-uniform grid
+            error_l2 = float(np.sqrt(np.sum(0.5 * dx * (error[:-1]**2 + error[1:]**2))))
+        else:
+            error_l2 = float(np.sqrt(dx * np.sum(error**2)))
+        error_max = float(np.max(np.abs(error)))
     else:
-        # For custom BCs, we don't have a simple exact solution
-        u_exact = None
+        error_l2 = error_max = None
 
     # Generate plots
     plots = {}
     
     # Plot final solution
     plt.figure(figsize=(10, 6))
-    plt.plot(x, u, 'b-', linewidth=2, label='Numerical')
+    plt.plot(x, u, 'b.-' if moving_grid else 'b-', linewidth=2, label='Numerical')
     if u_exact is not None:
         plt.plot(x, u_exact, 'r--', linewidth=2, label='Exact')
     plt.xlabel('x')
@@ -220,9 +938,9 @@ def simulate_burgers(params):
     
     # Plot solution at different times
     plt.figure(figsize=(10, 6))
-    for idx, save_idx in enumerate(save_indices):
-        t_val = times[save_idx]
-        plt.plot(x, u_all[save_idx], label=f't = {t_val:.2f}')
+    snapshot_times, snapshot_values = snapshots.result()
+    for t_val, x_saved, u_saved in zip(snapshot_times, grid_snapshots.result()[1], snapshot_values):
+        plt.plot(x_saved, u_saved, label=f't = {t_val:.2f}')
     plt.xlabel('x')
     plt.ylabel('u')
     plt.title('Solution Evolution Over Time')
@@ -277,8 +995,7 @@ def simulate_burgers(params):
     plots['update_norm'] = base64.b64encode(buf.read()).decode('utf-8')
     plt.close()
     
-    # Return results
-    return {
+    result = {
         'plots': {
             'waterfall': plots.get('time_evolution', ''),
             'animation': plots.get('final_solution', ''),
@@ -288,9 +1005,17 @@ def simulate_burgers(params):
             'dt': dt,
             'T': T,
             'nu': nu,
+            'time_scheme': time_scheme,
+            'flux_scheme': flux_scheme,
             'n_newton_iter': n_newton_iter,
-            'dx': dx,
+            'newton_tol': newton_tol,
+            'jacobian_reuse': jacobian_reuse,
+            'adaptive_dt': adaptive_dt,
+            'time_tol': time_tol,
+            'dx': (x_max - x_min) / (num_points - 1) if moving_grid else dx,
             'num_points': num_points,
+            'moving_grid': moving_grid,
+            'remesh_every': remesh_every,
             'left_value': left_value,
             'right_value': right_value
         },
@@ -298,6 +1023,205 @@ def simulate_burgers(params):
             'max_residual': max([item[0] for item in newton_history_all]) if newton_history_all else None,
             'min_residual': min([item[0] for item in newton_history_all]) if newton_history_all else None,
             'newton_iterations': n_newton_iter,
-            'time_steps': n_steps
+            'total_newton_iterations': total_newton_iterations,
+            'mean_newton_iterations_per_step': total_newton_iterations / max(accepted_steps, 1),
+            'max_newton_iterations_per_step': max_newton_iterations,
+            'jacobian_evaluations': work['jacobian_evaluations'],
+            'unconverged_steps': unconverged_steps,
+            'time_steps': n_steps,
+            'accepted_steps': accepted_steps,
+            'rejected_steps': rejected_steps,
+            'error_l2': error_l2,
+            'error_max': error_max,
+            'min_dx': float(np.min(dx)),
+            'max_dx': float(np.max(dx)),
+            'remeshes': remeshes
+        }
+    }
+
+    if save_every:
+        history_times, history_values = history.result()
+        result['history'] = {'save_every': save_every, 'times': history_times.tolist()}
+        if history_file:
+            result['history']['file'] = history_file
+            result['history']['shape'] = list(history_values.shape)
+        else:
+            result['history']['values'] = history_values.tolist()
+
+    return result 
+
+
+# Per-member settings an ensemble may vary; everything else is shared
+ENSEMBLE_MEMBER_KEYS = ('nu', 'left_value', 'right_value', 'ic_type')
+
+
+def simulate_burgers_ensemble(params, members):
+    """
+    Run simulate_burgers for many parameter sets that share a grid and time
+    step, advancing all of them in lockstep.
+
+    The states are stored as one (n_members, num_points) array; every Newton
+    iteration evaluates the residuals and Jacobians of all members together and
+    solves their tridiagonal systems in a single batched LAPACK call
+    (see newton_step_ensemble).
+
+    Parameters:
+    - params: shared parameters as for simulate_burgers (dt, T, n_newton_iter,
+      newton_tol, flux_scheme, x_min, x_max, num_points) plus defaults for
+      the member keys.
+      adaptive_dt, moving_grid, jacobian_reuse, history output and time
+      schemes other than backward Euler are not supported.
+    - members: list of dicts overriding any of ENSEMBLE_MEMBER_KEYS
+
+    Returns:
+      Dictionary with the shared grid and parameters, one result per member
+      (parameters, final solution, snapshots, error against the exact
+      solution when available, Newton statistics) and an overlay plot of
+      the final solutions
+    """
+    if not members:
+        raise ValueError("The ensemble needs at least one member")
+    if params.get('adaptive_dt') or params.get('moving_grid') or params.get('save_every') or params.get('history_file'):
+        raise ValueError("Ensembles need a fixed time step and grid and no history output")
+    if params.get('time_scheme', 'backward_euler') != 'backward_euler':
+        raise ValueError("Ensembles only support the backward_euler time scheme")
+    if params.get('jacobian_reuse'):
+        raise ValueError("Ensembles refactor every Jacobian; disable jacobian_reuse")
+
+    dt = float(params.get('dt', 0.5))
+    T = float(params.get('T', 20.0))
+    n_newton_iter = int(params.get('n_newton_iter', 7))
+    newton_tol = float(params.get('newton_tol', 1e-10))
+    flux_scheme = params.get('flux_scheme', 'central')
+    x_min = float(params.get('x_min', -10))
+    x_max = float(params.get('x_max', 30))
+    num_points = int(params.get('num_points', 501))
+    if flux_scheme not in FLUX_SCHEMES:
+        raise ValueError(f"Unknown flux_scheme: {flux_scheme}. Choose one of {', '.join(FLUX_SCHEMES)}")
+
+    member_params = []
+    for member in members:
+        merged = {key: params[key] for key in ENSEMBLE_MEMBER_KEYS if key in params}
+        merged.update({key: member[key] for key in ENSEMBLE_MEMBER_KEYS if key in member})
+        member_params.append({
+            'nu': float(merged.get('nu', 0.1)),
+            'left_value': float(merged.get('left_value', 1.0)),
+            'right_value': float(merged.get('right_value', 0.0)),
+            'ic_type': merged.get('ic_type', 'step')
+        })
+    num_members = len(member_params)
+
+    x = np.linspace(x_min, x_max, num_points)
+    dx = x[1] - x[0]
+    nu = np.array([[member['nu']] for member in member_params])
+    left_values = np.array([member['left_value'] for member in member_params])
+    right_values = np.array([member['right_value'] for member in member_params])
+
+    u = np.empty((num_members, num_points))
+    for row, member in enumerate(member_params):
+        u[row] = initial_condition(x, member['ic_type'], member['left_value'], member['right_value'], member['nu'])
+
+    work = allocate_newton_workspace(num_points, num_members)
+    u_old = np.empty((num_members, num_points))
+    # A non-positive tolerance runs all n_newton_iter iterations
+    stop_tol = newton_tol if newton_tol > 0 else None
+
+    save_times = [0.0, T/4, T/2, 3*T/4, T]
+    snapshots = SnapshotSink(len(save_times), (num_members, num_points))
+    snapshots.append(0.0, u)
+    next_save_idx = 1
+
+    n_steps = int(T / dt)
+    iterations_per_step = np.zeros((n_steps, num_members), dtype=int)
+    unconverged_steps = np.zeros(num_members, dtype=int)
+    first_history = [[] for _ in range(num_members)]
+    start = time.perf_counter()
+    t = 0.0
+    for n in range(n_steps):
+        np.copyto(u_old, u)
+        # Enforce Dirichlet BCs
+        u_old[:, 0] = left_values
+        u_old[:, -1] = right_values
+
+        u_new, newton_history, iterations, converged = newton_step_ensemble(
+            u_old, dt, dx, nu, n_iter=n_newton_iter, work=work, tol=stop_tol, flux_scheme=flux_scheme
+        )
+        np.copyto(u, u_new)
+        u[:, 0] = left_values
+        u[:, -1] = right_values
+
+        iterations_per_step[n] = iterations
+        unconverged_steps += ~converged
+        if n == 0:
+            first_history = newton_history
+
+        t += dt
+        if next_save_idx < len(save_times) and t >= save_times[next_save_idx]:
+            snapshots.append(t, u)
+            next_save_idx += 1
+    wall_time = time.perf_counter() - start
+
+    snapshot_times, snapshot_values = snapshots.result()
+    results = []
+    for row, member in enumerate(member_params):
+        u_exact = exact_solution(x, T, member['nu'], member['left_value'], member['right_value'])
+        residuals = [item[0] for item in first_history[row]]
+        results.append({
+            'parameters': member,
+            'final_solution': u[row].tolist(),
+            'snapshots': {
+                'times': snapshot_times.tolist(),
+                'values': snapshot_values[:, row].tolist()
+            },
+            'error_max': float(np.max(np.abs(u[row] - u_exact))) if u_exact is not None else None,
+            'statistics': {
+                'max_residual': max(residuals) if residuals else None,
+                'min_residual': min(residuals) if residuals else None,
+                'total_newton_iterations': int(iterations_per_step[:, row].sum()),
+                'mean_newton_iterations_per_step': float(iterations_per_step[:, row].mean()) if n_steps else 0.0,
+                'max_newton_iterations_per_step': int(iterations_per_step[:, row].max(initial=0)),
+                'unconverged_steps': int(unconverged_steps[row]),
+                'time_steps': n_steps
+            }
+        })
+
+    # Overlay of the final solutions (the legend only for small ensembles)
+    plt.figure(figsize=(10, 6))
+    for row, member in enumerate(member_params):
+        plt.plot(x, u[row], label=f"nu = {member['nu']:g}, u = ({member['left_value']:g}, {member['right_value']:g})")
+    plt.xlabel('x')
+    plt.ylabel('u')
+    plt.title(f'Viscous Burgers Ensemble at T = {T} ({num_members} members)')
+    if num_members <= 10:
+        plt.legend()
+    plt.grid(True)
+    plt.minorticks_on()
+    plt.tight_layout()
+
+    buf = BytesIO()
+    plt.savefig(buf, format='png', dpi=100)
+    buf.seek(0)
+    final_solutions_plot = base64.b64encode(buf.read()).decode('utf-8')
+    plt.close()
+
+    return {
+        'x': x.tolist(),
+        'members': results,
+        'plots': {'final_solutions': final_solutions_plot},
+        'parameters': {
+            'dt': dt,
+            'T': T,
+            'n_newton_iter': n_newton_iter,
+            'newton_tol': newton_tol,
+            'flux_scheme': flux_scheme,
+            'dx': dx,
+            'num_points': num_points,
+            'num_members': num_members
+        },
+        'statistics': {
+            'time_steps': n_steps,
+            'total_newton_iterations': int(iterations_per_step.sum()),
+            'jacobian_evaluations': work['jacobian_evaluations'],
+            'wall_time': wall_time
         }
-    } 
\ No newline at end of file
+    }
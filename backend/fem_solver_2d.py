@@ -1,9 +1,21 @@
 import sympy as sp
 import numpy as np
+import scipy.sparse as sparse
 import matplotlib.pyplot as plt
 from io import BytesIO
 import base64
+import time
 import mesh_generator_enhanced as mesh_generator
+from linear_solvers import select_solver, factorize, solve_linear_system
+from solver_cache import MemoryBoundedLRUCache
+
+# Memory budget for cached meshes, stiffness matrices and factorizations
+FACTORIZATION_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+_factorization_cache = MemoryBoundedLRUCache(FACTORIZATION_CACHE_MAX_BYTES)
+
+# 'auto' uses the structured grid whenever the domain has no holes
+MESH_TYPES = ('auto', 'structured', 'unstructured')
 
 
 def lagrange_basis_functions():
@@ -96,6 +108,84 @@ def calculate_everything_for_all_triangles(mesh):
     return all_basis_functions, derivatives, all_jacobians, all_jacobian_inverses, all_jacobian_det, all_jacobian_absolute_detJ, all_stiffness_matrices
 
 
+def calculate_stiffness_matrices_batched(vertices, triangles):
+    """
+    Compute Jacobians and local stiffness matrices for all triangles at once.
+
+    Linear triangles have constant shape function derivatives, so the
+    one-point quadrature used by comp_stiffness_matrix is exact and every
+    element reduces to a few stacked array operations.
+
+    Parameters:
+    vertices (array): Mesh vertices, shape (num_vertices, 2)
+    triangles (array): Triangle connectivity, shape (num_triangles, 3)
+
+    Returns:
+    tuple: Jacobian determinants (num_triangles,), inverse Jacobians
+           (num_triangles, 2, 2) and local stiffness matrices (num_triangles, 3, 3)
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    triangles = np.asarray(triangles, dtype=np.intp)
+    corners = vertices[triangles]
+
+    # J = [[dx/dr, dy/dr], [dx/ds, dy/ds]], matching jacobian_matrix
+    jacobians = np.empty((len(triangles), 2, 2))
+    jacobians[:, 0, :] = corners[:, 1, :] - corners[:, 0, :]
+    jacobians[:, 1, :] = corners[:, 2, :] - corners[:, 0, :]
+    detJ = jacobians[:, 0, 0] * jacobians[:, 1, 1] - jacobians[:, 0, 1] * jacobians[:, 1, 0]
+
+    jacobian_inverses = np.empty_like(jacobians)
+    jacobian_inverses[:, 0, 0] = jacobians[:, 1, 1] / detJ
+    jacobian_inverses[:, 0, 1] = -jacobians[:, 0, 1] / detJ
+    jacobian_inverses[:, 1, 0] = -jacobians[:, 1, 0] / detJ
+    jacobian_inverses[:, 1, 1] = jacobians[:, 0, 0] / detJ
+
+    # Reference gradients of N1, N2, N3 as columns: [[dN/dr], [dN/ds]]
+    _, derivatives = lagrange_basis_functions()
+    reference_gradients = np.array(derivatives, dtype=float).T
+    global_gradients = jacobian_inverses @ reference_gradients
+
+    points, weights = get_quadrature_points_and_weights()
+    scale = np.abs(detJ) * np.sum(weights)
+    stiffness_matrices = np.einsum('nki,nkj->nij', global_gradients, global_gradients) * scale[:, None, None]
+
+    return detJ, jacobian_inverses, stiffness_matrices
+
+
+def assemble_structured_stiffness(mesh):
+    """
+    Assemble the stiffness matrix of a structured grid from its stencil.
+
+    On a uniform grid whose cells are all split along the same diagonal, the
+    linear-triangle stiffness matrix is the 5-point stencil and factors as
+    K = My (x) Kx + Ky (x) Mx, where K* are 1D stiffness matrices and M* are
+    lumped 1D mass matrices. No element loop or element matrices are needed.
+
+    Parameters:
+    mesh (dict): Structured mesh from mesh_generator.generate_structured_mesh
+
+    Returns:
+    scipy.sparse.csr_matrix: Global stiffness matrix
+    """
+    nx, ny = (int(n) for n in mesh['grid_shape'])
+    hx, hy = (float(h) for h in mesh['grid_spacing'])
+
+    def stiffness_1d(n, h):
+        main = np.full(n + 1, 2.0)
+        main[[0, -1]] = 1.0
+        off = -np.ones(n)
+        return sparse.diags([off, main, off], [-1, 0, 1]) / h
+
+    def lumped_mass_1d(n, h):
+        main = np.full(n + 1, h)
+        main[[0, -1]] = h / 2
+        return sparse.diags(main)
+
+    global_matrix = (sparse.kron(lumped_mass_1d(ny, hy), stiffness_1d(nx, hx))
+                     + sparse.kron(stiffness_1d(ny, hy), lumped_mass_1d(nx, hx)))
+    return global_matrix.tocsr()
+
+
 def assemble_global_matrix(vertices, triangles, all_stiffness_matrices):
     num_vertices = len(vertices)
     global_matrix = np.zeros((num_vertices, num_vertices))
@@ -107,32 +197,53 @@ def assemble_global_matrix(vertices, triangles, all_stiffness_matrices):
     return global_matrix
 
 
-def apply_boundary_conditions(vertices, global_stiffness_matrix, global_load_vector, ibntag, bc_values):
+def assemble_global_matrix_sparse(num_vertices, triangles, all_stiffness_matrices):
     """
-    Apply Dirichlet boundary conditions with customizable values for each edge.
-    
+    Assemble the global stiffness matrix in sparse CSR format.
+
+    Every local 3x3 matrix contributes nine (row, col, value) triplets; the
+    COO to CSR conversion sums duplicate entries, so storage grows with the
+    number of elements instead of num_vertices ** 2.
+
     Parameters:
-    vertices (array): Mesh vertices
-    global_stiffness_matrix (array): Global stiffness matrix
-    global_load_vector (array): Global load vector (can be None)
-    ibntag (array): Boundary tags for each vertex
-    bc_values (dict): Dictionary with boundary values for each edge (keys: 1, 2, 3, 4)
-    
+    num_vertices (int): Number of mesh vertices
+    triangles (array): Triangle connectivity, shape (num_triangles, 3)
+    all_stiffness_matrices (array): Local stiffness matrices, shape (num_triangles, 3, 3)
+
     Returns:
-    tuple: Updated global stiffness matrix and load vector
+    scipy.sparse.csr_matrix: Global stiffness matrix
     """
-    num_vertices = len(vertices)
-    if global_load_vector is None:
-        global_load_vector = np.zeros(num_vertices)
-    
-    for idx, vertex in enumerate(vertices):
-        tag = ibntag[idx]
-        if tag in bc_values:
-            global_stiffness_matrix[idx, :] = 0
-            global_stiffness_matrix[idx, idx] = 1
-            global_load_vector[idx] = bc_values[tag]
-    
-    return global_stiffness_matrix, global_load_vector
+    triangles = np.asarray(triangles, dtype=np.intp)
+    local = np.asarray(all_stiffness_matrices, dtype=float)
+    rows = np.repeat(triangles, 3, axis=1).ravel()
+    cols = np.tile(triangles, (1, 3)).ravel()
+    global_matrix = sparse.coo_matrix((local.ravel(), (rows, cols)), shape=(num_vertices, num_vertices))
+    return global_matrix.tocsr()
+
+
+def partition_dirichlet_system(global_stiffness_matrix, is_fixed):
+    """
+    Split a sparse stiffness matrix into free-free and free-fixed blocks.
+
+    This is the solver's only Dirichlet treatment: the fixed vertices are
+    eliminated, leaving the symmetric positive definite system
+    K_ff u_f = -K_fc u_c, whose right-hand side solve_prepared_system_2d
+    builds from the boundary values (see fixed_tag_indicator).
+
+    Parameters:
+    global_stiffness_matrix (sparse matrix): Global stiffness matrix
+    is_fixed (array): Boolean mask of Dirichlet vertices
+
+    Returns:
+    tuple: Free-free block (SPD), free-fixed coupling block, free vertex
+           indices and fixed vertex indices
+    """
+    free_nodes = np.flatnonzero(~is_fixed)
+    fixed_nodes = np.flatnonzero(is_fixed)
+    free_rows = sparse.csr_matrix(global_stiffness_matrix)[free_nodes]
+    free_matrix = free_rows[:, free_nodes].tocsr()
+    coupling_matrix = free_rows[:, fixed_nodes].tocsr()
+    return free_matrix, coupling_matrix, free_nodes, fixed_nodes
 
 
 def plot_solution_as_base64(vertices, triangles, u, title="FEM Solution"):
@@ -209,9 +320,253 @@ def plot_solution_3d_as_base64(vertices, triangles, u, title="3D FEM Solution"):
     return base64.b64encode(image_png).decode('utf-8')
 
 
+def use_structured_mesh(mesh_type, with_holes=False, hole_rows=0, hole_cols=0, hole_radius=0.5):
+    """
+    Resolve a mesh_type option to whether the structured grid should be used.
+
+    Parameters:
+    mesh_type (str): 'auto', 'structured' or 'unstructured'
+    with_holes, hole_rows, hole_cols, hole_radius: Hole layout of the domain
+
+    Returns:
+    bool: True for the structured grid
+    """
+    if mesh_type not in MESH_TYPES:
+        raise ValueError(f"Unknown mesh type: {mesh_type}. Choose one of {', '.join(MESH_TYPES)}")
+    has_holes = with_holes and hole_rows > 0 and hole_cols > 0 and hole_radius > 0
+    if mesh_type == 'auto':
+        return not has_holes
+    return mesh_type == 'structured'
+
+
+def prepare_heat_system_2d(width=10, height=10, mesh_density=0.05, mesh_quality=30,
+                           dirichlet_tags=(1, 2, 3, 4), with_holes=False, hole_rows=0, hole_cols=0,
+                           hole_radius=0.5, batched=True, solver='auto', use_mesh_cache=True,
+                           mesh_type='auto'):
+    """
+    Generate the mesh, assemble the stiffness matrix and factorize the free block.
+
+    Everything returned depends only on the geometry, the set of Dirichlet
+    tags and the solver, not on the boundary values, so it can be reused for
+    any bc_values with the same keys.
+
+    Parameters:
+    width, height, mesh_density, mesh_quality, with_holes, hole_rows, hole_cols,
+    hole_radius: Same as solve_heat_equation_2d
+    dirichlet_tags (iterable): Boundary tags that carry Dirichlet values
+    batched (bool): Use the vectorized element kernel
+    solver (str): Linear solver backend ('auto', 'splu', 'cholesky' or 'cg')
+    use_mesh_cache (bool): Reuse a cached mesh for the same geometry
+    mesh_type (str): 'auto', 'structured' or 'unstructured'; structured grids
+                     are assembled from their stencil when batched is True
+
+    Returns:
+    dict: Mesh, global and partitioned matrices, node partition, resolved
+          solver name and its factorization
+    """
+    start = time.perf_counter()
+    structured = use_structured_mesh(mesh_type, with_holes, hole_rows, hole_cols, hole_radius)
+    mesh = mesh_generator.plot_geometry_and_generate_mesh(
+        width=width, height=height, density=mesh_density, quality=mesh_quality,
+        with_holes=with_holes, hole_rows=hole_rows, hole_cols=hole_cols, hole_radius=hole_radius,
+        use_cache=use_mesh_cache, structured=structured
+    )
+    
+    if structured and batched:
+        global_stiffness_matrix = assemble_structured_stiffness(mesh)
+    elif batched:
+        all_detJ, all_jacobian_inverse, all_stiffness_matrices = calculate_stiffness_matrices_batched(
+            mesh['vertices'], mesh['triangles']
+        )
+    else:
+        all_basis_functions, derivatives, all_jacobian, all_jacobian_inverse, all_detJ, all_abs_detJ, all_stiffness_matrices = calculate_everything_for_all_triangles(mesh)
+    if not (structured and batched):
+        global_stiffness_matrix = assemble_global_matrix_sparse(
+            len(mesh['vertices']), mesh['triangles'], all_stiffness_matrices
+        )
+    
+    is_fixed = np.isin(mesh['ibntag'], list(dirichlet_tags))
+    free_matrix, coupling_matrix, free_nodes, fixed_nodes = partition_dirichlet_system(
+        global_stiffness_matrix, is_fixed
+    )
+    if solver == 'auto':
+        solver = select_solver(len(free_nodes), symmetric=True)
+    factor = factorize(free_matrix, solver)
+    
+    return {
+        "mesh": mesh,
+        "stiffness_matrix": global_stiffness_matrix,
+        "free_matrix": free_matrix,
+        "coupling_matrix": coupling_matrix,
+        "free_nodes": free_nodes,
+        "fixed_nodes": fixed_nodes,
+        "dirichlet_tags": tuple(sorted(dirichlet_tags)),
+        "structured": structured,
+        "solver": solver,
+        "factor": factor,
+        "setup_time": time.perf_counter() - start
+    }
+
+
+def get_heat_system_2d(width=10, height=10, mesh_density=0.05, mesh_quality=30,
+                       dirichlet_tags=(1, 2, 3, 4), with_holes=False, hole_rows=0, hole_cols=0,
+                       hole_radius=0.5, batched=True, solver='auto', use_cache=True,
+                       mesh_type='auto'):
+    """
+    Return a prepared heat system, reusing the factorization cache when possible.
+
+    Parameters:
+    Same as prepare_heat_system_2d, plus
+    use_cache (bool): Look up and store the system in the factorization cache
+
+    Returns:
+    tuple: Prepared system dict and whether it came from the cache
+    """
+    structured = use_structured_mesh(mesh_type, with_holes, hole_rows, hole_cols, hole_radius)
+    mesh_key = mesh_generator.mesh_cache_key(
+        width, height, mesh_density, mesh_quality, with_holes, hole_rows, hole_cols, hole_radius,
+        structured
+    )
+    key = (mesh_key, tuple(sorted(dirichlet_tags)), bool(batched), solver)
+    
+    if use_cache:
+        system = _factorization_cache.get(key)
+        if system is not None:
+            return system, True
+    
+    system = prepare_heat_system_2d(
+        width=width, height=height, mesh_density=mesh_density, mesh_quality=mesh_quality,
+        dirichlet_tags=dirichlet_tags, with_holes=with_holes, hole_rows=hole_rows,
+        hole_cols=hole_cols, hole_radius=hole_radius, batched=batched, solver=solver,
+        use_mesh_cache=use_cache, mesh_type=mesh_type
+    )
+    if use_cache:
+        system['cache_key'] = key
+        _factorization_cache.put(key, system)
+    return system, False
+
+
+def update_cached_system(system):
+    """Re-store a cached system after adding data to it so its size is recounted."""
+    if 'cache_key' in system:
+        _factorization_cache.put(system['cache_key'], system)
+
+
+def fixed_tag_indicator(system):
+    """Return a (num_fixed, num_tags) 0/1 matrix mapping Dirichlet tags to fixed vertices."""
+    fixed_tags = np.asarray(system['mesh']['ibntag'])[system['fixed_nodes']]
+    return (fixed_tags[:, None] == np.array(system['dirichlet_tags'])[None, :]).astype(float)
+
+
+def compute_unit_responses(system, solver_tol=1e-10):
+    """
+    Solve once per Dirichlet tag for a unit value on that tag and zero elsewhere.
+
+    The steady heat problem is linear in the boundary values, so the solution
+    for any bc_values is the sum of these fields weighted by the tag values.
+    The responses are stored in the system dict as a (num_vertices, num_tags)
+    array, one column per entry of system['dirichlet_tags'].
+
+    Parameters:
+    system (dict): Prepared system from get_heat_system_2d
+    solver_tol (float): Relative residual tolerance for the 'cg' backend
+
+    Returns:
+    array: Unit response fields, shape (num_vertices, num_tags)
+    """
+    fixed_nodes = system['fixed_nodes']
+    unit_values = fixed_tag_indicator(system)
+    responses = np.empty((len(system['mesh']['ibntag']), unit_values.shape[1]))
+    responses[fixed_nodes] = unit_values
+    responses[system['free_nodes']], _ = solve_linear_system(
+        system['free_matrix'], -(system['coupling_matrix'] @ unit_values),
+        method=system['solver'], tol=solver_tol, factor=system['factor']
+    )
+    
+    system['unit_responses'] = responses
+    update_cached_system(system)
+    return responses
+
+
+def get_factorization_cache_stats():
+    """Return size and hit/miss counters of the factorization cache."""
+    return _factorization_cache.stats()
+
+
+def clear_factorization_cache():
+    """Drop all cached meshes, matrices and factorizations."""
+    _factorization_cache.clear()
+
+
+def solve_prepared_system_2d(system, bc_values_list, solver_tol=1e-10, superposition=False):
+    """
+    Solve a prepared system for one or more sets of boundary values at once.
+
+    All right-hand sides are stacked into one matrix and handed to the
+    solver in a single call, reusing the system's factorization.
+
+    Parameters:
+    system (dict): Prepared system from get_heat_system_2d
+    bc_values_list (list): Boundary value dicts, all with the system's Dirichlet tags
+    solver_tol (float): Relative residual tolerance for the 'cg' backend
+    superposition (bool): Combine cached unit responses instead of solving
+
+    Returns:
+    tuple: Solutions of shape (num_vertices, num_scenarios), solver info dict
+           and the time spent computing unit responses
+    """
+    tags = system['dirichlet_tags']
+    for bc_values in bc_values_list:
+        if tuple(sorted(bc_values)) != tags:
+            raise ValueError(f"Boundary values must be given for tags {list(tags)}, got {sorted(bc_values)}")
+    tag_values = np.array([[bc_values[tag] for bc_values in bc_values_list] for tag in tags], dtype=float)
+    
+    response_time = 0.0
+    if superposition:
+        start = time.perf_counter()
+        responses = system.get('unit_responses')
+        if responses is None:
+            responses = compute_unit_responses(system, solver_tol)
+            response_time = time.perf_counter() - start
+            start = time.perf_counter()
+        solutions = responses @ tag_values
+        solver_info = {
+            "solver": "superposition",
+            "iterations": None,
+            "residual": None,
+            "wall_time": time.perf_counter() - start
+        }
+        return solutions, solver_info, response_time
+    
+    # Only the right-hand side depends on the boundary values
+    fixed_values = fixed_tag_indicator(system) @ tag_values
+    reduced_rhs = -(system['coupling_matrix'] @ fixed_values)
+    
+    # Solve the reduced (symmetric positive definite) system
+    solutions = np.empty((len(system['mesh']['vertices']), len(bc_values_list)))
+    solutions[system['fixed_nodes']] = fixed_values
+    solutions[system['free_nodes']], solver_info = solve_linear_system(
+        system['free_matrix'], reduced_rhs, method=system['solver'], tol=solver_tol,
+        factor=system['factor']
+    )
+    return solutions, solver_info, response_time
+
+
+def get_mesh_plot(system):
+    """Return the mesh plot of a prepared system, generating it once per cached system."""
+    mesh_plot = system.get('mesh_plot')
+    if mesh_plot is None:
+        mesh_plot = mesh_generator.plot_mesh_as_base64(system['mesh'])
+        system['mesh_plot'] = mesh_plot
+        update_cached_system(system)
+    return mesh_plot
+
+
 def solve_heat_equation_2d(width=10, height=10, mesh_density=0.05, mesh_quality=30, 
                           bc_values={1: 0, 2: 0, 3: 1, 4: 1}, with_holes=False,
-                          hole_rows=0, hole_cols=0, hole_radius=0.5):
+                          hole_rows=0, hole_cols=0, hole_radius=0.5, batched=True,
+                          solver='auto', solver_tol=1e-10, use_cache=True, superposition=False,
+                          mesh_type='auto'):
     """
     Solve the 2D heat equation using FEM with customizable parameters.
     
@@ -225,29 +580,34 @@ def solve_heat_equation_2d(width=10, height=10, mesh_density=0.05, mesh_quality=
     hole_rows (int): Number of rows of holes (only used if with_holes=True)
     hole_cols (int): Number of columns of holes (only used if with_holes=True)
     hole_radius (float): Radius of the holes (only used if with_holes=True)
+    batched (bool): Compute element matrices with the vectorized kernel instead
+                    of the per-triangle loop
+    solver (str): Linear solver backend ('auto', 'splu', 'cholesky' or 'cg')
+    solver_tol (float): Relative residual tolerance for the 'cg' backend
+    use_cache (bool): Reuse the mesh, matrices and factorization of an earlier
+                      solve with the same geometry and Dirichlet tags
+    superposition (bool): Answer from cached per-tag unit responses, with no
+                          linear solve once they exist for the mesh
+    mesh_type (str): 'auto' (structured grid when there are no holes),
+                     'structured' or 'unstructured'
     
     Returns:
     dict: Results including solution, mesh, and plots
     """
-    # Generate mesh
-    mesh = mesh_generator.plot_geometry_and_generate_mesh(
-        width=width, height=height, density=mesh_density, quality=mesh_quality,
-        with_holes=with_holes, hole_rows=hole_rows, hole_cols=hole_cols, hole_radius=hole_radius
+    system, cache_hit = get_heat_system_2d(
+        width=width, height=height, mesh_density=mesh_density, mesh_quality=mesh_quality,
+        dirichlet_tags=bc_values.keys(), with_holes=with_holes, hole_rows=hole_rows,
+        hole_cols=hole_cols, hole_radius=hole_radius, batched=batched, solver=solver,
+        use_cache=use_cache, mesh_type=mesh_type
     )
+    mesh = system['mesh']
+    mesh_plot = get_mesh_plot(system)
     
-    # Get mesh plot
-    mesh_plot = mesh_generator.plot_mesh_as_base64(mesh)
-    
-    # Solve FEM problem
-    ibntag = mesh['ibntag']
-    all_basis_functions, derivatives, all_jacobian, all_jacobian_inverse, all_detJ, all_abs_detJ, all_stiffness_matrices = calculate_everything_for_all_triangles(mesh)
-    global_stiffness_matrix = assemble_global_matrix(mesh['vertices'], mesh['triangles'], all_stiffness_matrices)
-    global_stiffness_matrix, global_load_vector = apply_boundary_conditions(
-        mesh['vertices'], global_stiffness_matrix, None, ibntag, bc_values
+    solutions, solver_info, response_time = solve_prepared_system_2d(
+        system, [bc_values], solver_tol=solver_tol, superposition=superposition
     )
-    
-    # Solve the system
-    u = np.linalg.solve(global_stiffness_matrix, global_load_vector)
+    u = solutions[:, 0]
+    setup_time = (0.0 if cache_hit else system["setup_time"]) + response_time
     
     # Generate plots
     contour_plot = plot_solution_as_base64(mesh['vertices'], mesh['triangles'], u, "2D Heat Equation - Contour Plot")
@@ -276,8 +636,102 @@ def solve_heat_equation_2d(width=10, height=10, mesh_density=0.05, mesh_quality=
             "with_holes": with_holes,
             "hole_rows": hole_rows,
             "hole_cols": hole_cols,
-            "hole_radius": hole_radius
+            "hole_radius": hole_radius,
+            "mesh_type": "structured" if system["structured"] else "unstructured",
+            "solver": solver_info["solver"],
+            "solver_iterations": solver_info["iterations"],
+            "solver_residual": solver_info["residual"],
+            "solver_time": solver_info["wall_time"],
+            "setup_time": setup_time,
+            "cache_hit": cache_hit
         }
     }
     
-    return results 
\ No newline at end of file
+    return results 
+
+
+def solve_heat_equation_2d_batch(width=10, height=10, mesh_density=0.05, mesh_quality=30,
+                                bc_values_list=({1: 0, 2: 0, 3: 1, 4: 1},), with_holes=False,
+                                hole_rows=0, hole_cols=0, hole_radius=0.5, batched=True,
+                                solver='auto', solver_tol=1e-10, use_cache=True,
+                                superposition=False, include_plots=False, mesh_type='auto'):
+    """
+    Solve the 2D heat equation for many boundary-value scenarios on one mesh.
+    
+    The mesh is generated, assembled and factorized once, and all scenarios
+    are solved together as a multi-column right-hand side.
+    
+    Parameters:
+    bc_values_list (list): Boundary value dicts, all with the same tags
+    include_plots (bool or list): Whether to generate contour and surface plots,
+                                  either for all scenarios or per scenario
+    Other parameters are the same as solve_heat_equation_2d.
+    
+    Returns:
+    dict: Shared mesh and parameters plus per-scenario solutions and plots
+    """
+    bc_values_list = list(bc_values_list)
+    if not bc_values_list:
+        raise ValueError("At least one set of boundary values is required")
+    if isinstance(include_plots, bool):
+        include_plots = [include_plots] * len(bc_values_list)
+    if len(include_plots) != len(bc_values_list):
+        raise ValueError("include_plots must have one entry per scenario")
+    
+    system, cache_hit = get_heat_system_2d(
+        width=width, height=height, mesh_density=mesh_density, mesh_quality=mesh_quality,
+        dirichlet_tags=bc_values_list[0].keys(), with_holes=with_holes, hole_rows=hole_rows,
+        hole_cols=hole_cols, hole_radius=hole_radius, batched=batched, solver=solver,
+        use_cache=use_cache, mesh_type=mesh_type
+    )
+    mesh = system['mesh']
+    
+    solutions, solver_info, response_time = solve_prepared_system_2d(
+        system, bc_values_list, solver_tol=solver_tol, superposition=superposition
+    )
+    
+    scenarios = []
+    for k, bc_values in enumerate(bc_values_list):
+        u = solutions[:, k]
+        plots = None
+        if include_plots[k]:
+            plots = {
+                "contour": plot_solution_as_base64(mesh['vertices'], mesh['triangles'], u, "2D Heat Equation - Contour Plot"),
+                "surface": plot_solution_3d_as_base64(mesh['vertices'], mesh['triangles'], u, "2D Heat Equation - Surface Plot")
+            }
+        scenarios.append({
+            "bc_values": bc_values,
+            "solution": u.tolist(),
+            "plots": plots
+        })
+    
+    return {
+        "mesh": {
+            "vertices": mesh['vertices'].tolist(),
+            "triangles": mesh['triangles'].tolist(),
+            "num_vertices": len(mesh['vertices']),
+            "num_triangles": len(mesh['triangles'])
+        },
+        "scenarios": scenarios,
+        "plots": {
+            "mesh": get_mesh_plot(system) if any(include_plots) else None
+        },
+        "parameters": {
+            "width": width,
+            "height": height,
+            "mesh_density": mesh_density,
+            "mesh_quality": mesh_quality,
+            "with_holes": with_holes,
+            "hole_rows": hole_rows,
+            "hole_cols": hole_cols,
+            "hole_radius": hole_radius,
+            "num_scenarios": len(bc_values_list),
+            "mesh_type": "structured" if system["structured"] else "unstructured",
+            "solver": solver_info["solver"],
+            "solver_iterations": solver_info["iterations"],
+            "solver_residual": solver_info["residual"],
+            "solver_time": solver_info["wall_time"],
+            "setup_time": (0.0 if cache_hit else system["setup_time"]) + response_time,
+            "cache_hit": cache_hit
+        }
+    }
@@ -3,6 +3,43 @@ import triangle as tr
 import matplotlib.pyplot as plt
 from io import BytesIO
 import base64
+import hashlib
+import json
+import os
+import tempfile
+from solver_cache import MemoryBoundedLRUCache
+
+# Boundary tags stored in mesh['ibntag']
+BOTTOM_TAG = 1
+LEFT_TAG = 2
+TOP_TAG = 3
+RIGHT_TAG = 4
+HOLE_TAG = 5
+INTERIOR_TAG = 6
+
+# Bump when the mesh layout or tagging changes so stale disk entries are ignored
+MESH_CACHE_VERSION = 3
+MESH_CACHE_MAX_BYTES = 256 * 1024 * 1024
+MESH_CACHE_DISK_MAX_BYTES = 1024 * 1024 * 1024
+MESH_CACHE_DIR = os.environ.get('MESH_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'calcdynamics_mesh_cache'))
+
+_mesh_cache = MemoryBoundedLRUCache(MESH_CACHE_MAX_BYTES)
+_disk_cache_hits = 0
+
+def boundary_tags_from_markers(vertex_markers, interior_tag=INTERIOR_TAG):
+    """
+    Convert Triangle vertex markers into a compact boundary tag array.
+    
+    Parameters:
+    vertex_markers (array): Vertex markers returned by triangle.triangulate
+    interior_tag (int): Tag assigned to vertices that are not on a segment
+    
+    Returns:
+    array: int8 boundary tag for each vertex
+    """
+    tags = np.asarray(vertex_markers).ravel().astype(np.int8)
+    tags[tags == 0] = interior_tag
+    return tags
 
 def generate_mesh_with_options(width=10, height=10, density=0.05, quality=30, with_holes=False, 
                               hole_rows=0, hole_cols=0, hole_radius=0.5):
@@ -22,66 +59,113 @@ def generate_mesh_with_options(width=10, height=10, density=0.05, quality=30, wi
     Returns:
     dict: Mesh data including vertices, triangles, and boundary tags
     """
-    # Create rectangle vertices
-    square_vertices = np.array([[0, 0], [width, 0], [width, height], [0, height]])
-    vertices = square_vertices
-    segments = np.array([[i, (i + 1) % 4] for i in range(4)])
+    # Create rectangle vertices; segments run bottom, right, top, left
+    vertices = np.array([[0, 0], [width, 0], [width, height], [0, height]], dtype=float)
+    segments = np.array([[0, 1], [1, 2], [2, 3], [3, 0]])
+    segment_markers = np.array([BOTTOM_TAG, RIGHT_TAG, TOP_TAG, LEFT_TAG])
     
-    # Initialize vertex tags
-    vertex_tags = [0, 0, 0, 0]  # Initial tags for the four corners
+    # Corners take the tag of the first matching edge in bottom, left, top, right order
+    vertex_markers = np.array([BOTTOM_TAG, BOTTOM_TAG, TOP_TAG, LEFT_TAG])
     
     # Add holes if requested
-    hole_centers = []
+    hole_centers = np.empty((0, 2))
     if with_holes and hole_rows > 0 and hole_cols > 0 and hole_radius > 0:
         x_spacing = width / (hole_cols + 1)
         y_spacing = height / (hole_rows + 1)
         
-        for i in range(1, hole_cols + 1):
-            for j in range(1, hole_rows + 1):
-                center = np.array([i * x_spacing, j * y_spacing])
-                hole_centers.append(center)
-                
-                # Create circle vertices for this hole
-                circle = np.array([center + [hole_radius * np.cos(angle), hole_radius * np.sin(angle)] 
-                                  for angle in np.linspace(0, 2 * np.pi, num=32, endpoint=False)])
-                
-                circle_idx_start = len(vertices)
-                vertices = np.vstack([vertices, circle])
-                
-                # Create segments for this circle
-                circle_segments = np.array([[circle_idx_start + k, circle_idx_start + (k + 1) % 32] 
-                                           for k in range(32)])
-                segments = np.vstack([segments, circle_segments])
-                
-                # Tag the circle vertices with tag 5 (hole boundary)
-                vertex_tags.extend([5] * 32)
-    
-    # Generate mesh
-    mesh_input = {'vertices': vertices, 'segments': segments}
-    if hole_centers:
+        # Hole centers column by column, then 32-gon vertices and segments per hole
+        ii, jj = np.meshgrid(np.arange(1, hole_cols + 1), np.arange(1, hole_rows + 1), indexing='ij')
+        hole_centers = np.column_stack([ii.ravel() * x_spacing, jj.ravel() * y_spacing])
+        angles = np.linspace(0, 2 * np.pi, num=32, endpoint=False)
+        offsets = hole_radius * np.column_stack([np.cos(angles), np.sin(angles)])
+        circles = (hole_centers[:, None, :] + offsets[None, :, :]).reshape(-1, 2)
+        
+        starts = len(vertices) + 32 * np.arange(len(hole_centers))
+        k = np.arange(32)
+        circle_segments = np.stack([starts[:, None] + k, starts[:, None] + (k + 1) % 32], axis=-1).reshape(-1, 2)
+        
+        vertices = np.vstack([vertices, circles])
+        segments = np.vstack([segments, circle_segments])
+        segment_markers = np.concatenate([segment_markers, np.full(len(circle_segments), HOLE_TAG)])
+        vertex_markers = np.concatenate([vertex_markers, np.full(len(circles), HOLE_TAG)])
+    
+    # Generate mesh; Triangle propagates segment markers to vertices it inserts on segments
+    mesh_input = {
+        'vertices': vertices,
+        'segments': segments,
+        'segment_markers': segment_markers[:, None],
+        'vertex_markers': vertex_markers[:, None]
+    }
+    if len(hole_centers):
         mesh_input['holes'] = hole_centers
     
-    mesh = tr.triangulate(mesh_input, f'pq{quality}a{density}')
-    
-    # Complete the vertex tags for all mesh vertices
-    additional_tags = [6] * (len(mesh['vertices']) - len(vertex_tags))
-    vertex_tags.extend(additional_tags)
-    
-    # Tag vertices based on their position
-    for i, vertex in enumerate(mesh['vertices']):
-        x, y = vertex
-        if abs(y - 0) < 1e-10:  # Bottom edge (y = 0)
-            vertex_tags[i] = 1
-        elif abs(x - 0) < 1e-10:  # Left edge (x = 0)
-            vertex_tags[i] = 2
-        elif abs(y - height) < 1e-10:  # Top edge (y = height)
-            vertex_tags[i] = 3
-        elif abs(x - width) < 1e-10:  # Right edge (x = width)
-            vertex_tags[i] = 4
-    
-    mesh['ibntag'] = np.array(vertex_tags)
+    mesh = tr.triangulate(mesh_input, f'pq{quality}a{np.format_float_positional(density, trim="-")}')
+    
+    mesh['ibntag'] = boundary_tags_from_markers(mesh['vertex_markers'], INTERIOR_TAG)
     return mesh
 
+def generate_structured_mesh(width=10, height=10, density=0.05):
+    """
+    Generate a structured triangulated grid on a hole-free rectangle in closed form.
+    
+    Each grid cell is split along the same diagonal into two right triangles
+    of area at most density. Vertices are numbered row by row (x fastest).
+    
+    Parameters:
+    width (float): Width of the rectangular domain
+    height (float): Height of the rectangular domain
+    density (float): Maximum triangle area
+    
+    Returns:
+    dict: Mesh data including vertices, triangles, segments, boundary tags and
+          the grid shape (nx, ny) and spacing (hx, hy)
+    """
+    spacing = np.sqrt(2 * density)
+    nx = max(1, int(np.ceil(width / spacing)))
+    ny = max(1, int(np.ceil(height / spacing)))
+    
+    x = np.linspace(0, width, nx + 1)
+    y = np.linspace(0, height, ny + 1)
+    xx, yy = np.meshgrid(x, y)
+    vertices = np.column_stack([xx.ravel(), yy.ravel()])
+    
+    # Lower-left corner of every cell, then two counterclockwise triangles per cell
+    ii, jj = np.meshgrid(np.arange(nx), np.arange(ny))
+    v00 = (jj * (nx + 1) + ii).ravel()
+    v10 = v00 + 1
+    v01 = v00 + nx + 1
+    v11 = v01 + 1
+    triangles = np.vstack([np.column_stack([v00, v10, v11]), np.column_stack([v00, v11, v01])])
+    
+    # Later assignments win, giving the bottom, left, top, right corner order
+    grid_i = np.tile(np.arange(nx + 1), ny + 1)
+    grid_j = np.repeat(np.arange(ny + 1), nx + 1)
+    ibntag = np.full(len(vertices), INTERIOR_TAG, dtype=np.int8)
+    ibntag[grid_i == nx] = RIGHT_TAG
+    ibntag[grid_j == ny] = TOP_TAG
+    ibntag[grid_i == 0] = LEFT_TAG
+    ibntag[grid_j == 0] = BOTTOM_TAG
+    
+    # Boundary segments counterclockwise: bottom, right, top, left
+    bottom = np.arange(nx + 1)
+    right = nx + (nx + 1) * np.arange(ny + 1)
+    top = (nx + 1) * ny + np.arange(nx, -1, -1)
+    left = (nx + 1) * np.arange(ny, -1, -1)
+    sides = [(bottom, BOTTOM_TAG), (right, RIGHT_TAG), (top, TOP_TAG), (left, LEFT_TAG)]
+    segments = np.vstack([np.column_stack([side[:-1], side[1:]]) for side, _ in sides])
+    segment_markers = np.concatenate([np.full(len(side) - 1, tag) for side, tag in sides])
+    
+    return {
+        'vertices': vertices,
+        'vertex_markers': np.where(ibntag == INTERIOR_TAG, 0, ibntag).astype(np.int32)[:, None],
+        'triangles': triangles.astype(np.int32),
+        'segments': segments.astype(np.int32),
+        'segment_markers': segment_markers.astype(np.int32)[:, None],
+        'ibntag': ibntag,
+        'grid_shape': np.array([nx, ny]),
+        'grid_spacing': np.array([x[1] - x[0], y[1] - y[0]])
+    }
+
 # Add an alias for backward compatibility
 generate_mesh_with_holes = generate_mesh_with_options
 
@@ -110,8 +194,168 @@ def plot_mesh_as_base64(mesh):
     
     return base64.b64encode(image_png).decode('utf-8')
 
+def mesh_cache_key(width=10, height=10, density=0.05, quality=30, with_holes=False,
+                   hole_rows=0, hole_cols=0, hole_radius=0.5, structured=False):
+    """
+    Return a canonical hash of the parameters that determine a mesh.
+    
+    Hole parameters are ignored when no holes are generated, and quality is
+    ignored for structured grids, so equivalent requests map to the same key.
+    
+    Returns:
+    str: Hex SHA-256 digest
+    """
+    has_holes = bool(with_holes and hole_rows > 0 and hole_cols > 0 and hole_radius > 0)
+    structured = bool(structured and not has_holes)
+    params = {
+        "version": MESH_CACHE_VERSION,
+        "structured": structured,
+        "width": float(width),
+        "height": float(height),
+        "density": float(density),
+        "quality": 0.0 if structured else float(quality),
+        "hole_rows": int(hole_rows) if has_holes else 0,
+        "hole_cols": int(hole_cols) if has_holes else 0,
+        "hole_radius": float(hole_radius) if has_holes else 0.0
+    }
+    canonical = json.dumps(params, sort_keys=True)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def _freeze_mesh(mesh):
+    # Cached arrays are shared between requests, so make them read-only
+    for value in mesh.values():
+        value.flags.writeable = False
+    return mesh
+
+def _disk_mesh_files():
+    # Complete cache entries; partial writes start with '.'
+    if not os.path.isdir(MESH_CACHE_DIR):
+        return []
+    return [os.path.join(MESH_CACHE_DIR, name) for name in os.listdir(MESH_CACHE_DIR)
+            if name.endswith('.npz') and not name.startswith('.')]
+
+def _load_mesh_from_disk(key):
+    path = os.path.join(MESH_CACHE_DIR, f'{key}.npz')
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            mesh = {name: data[name] for name in data.files}
+    except (OSError, ValueError) as e:
+        print(f"Warning: could not read cached mesh {path}: {e}")
+        return None
+    try:
+        # Mark the entry as recently used for _evict_disk_meshes
+        os.utime(path)
+    except OSError:
+        pass
+    return mesh
+
+def _evict_disk_meshes(max_bytes=MESH_CACHE_DISK_MAX_BYTES):
+    # Delete the least recently used entries until the directory fits in max_bytes
+    entries = []
+    for path in _disk_mesh_files():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+def _save_mesh_to_disk(key, mesh):
+    path = os.path.join(MESH_CACHE_DIR, f'{key}.npz')
+    tmp_path = None
+    try:
+        os.makedirs(MESH_CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=MESH_CACHE_DIR, prefix='.partial-', suffix='.npz')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **mesh)
+        os.replace(tmp_path, path)
+        tmp_path = None
+        _evict_disk_meshes()
+    except Exception as e:
+        # The disk cache is best effort: a failed write must not fail the request
+        print(f"Warning: could not write cached mesh {path}: {e}")
+    finally:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+def get_mesh_cached(width=10, height=10, density=0.05, quality=30, with_holes=False,
+                    hole_rows=0, hole_cols=0, hole_radius=0.5, structured=False):
+    """
+    Return a mesh from the in-process or on-disk cache, triangulating only on a miss.
+    
+    Parameters are the same as plot_geometry_and_generate_mesh. The returned
+    arrays are shared with the cache and read-only.
+    
+    Returns:
+    dict: Mesh data including vertices, triangles, segments and boundary tags
+    """
+    global _disk_cache_hits
+    key = mesh_cache_key(width, height, density, quality, with_holes, hole_rows, hole_cols, hole_radius, structured)
+    
+    mesh = _mesh_cache.get(key)
+    if mesh is not None:
+        return dict(mesh)
+    
+    mesh = _load_mesh_from_disk(key)
+    if mesh is not None:
+        _disk_cache_hits += 1
+    else:
+        mesh = plot_geometry_and_generate_mesh(
+            width, height, density, quality, with_holes, hole_rows, hole_cols, hole_radius,
+            use_cache=False, structured=structured
+        )
+        _save_mesh_to_disk(key, mesh)
+    
+    mesh = _freeze_mesh(mesh)
+    _mesh_cache.put(key, mesh)
+    return dict(mesh)
+
+def get_mesh_cache_stats():
+    """
+    Report size and hit rates of the in-process and on-disk mesh caches.
+    
+    Returns:
+    dict: Memory cache statistics plus disk hits, entry count and size
+    """
+    stats = _mesh_cache.stats()
+    disk_files = _disk_mesh_files()
+    lookups = stats['hits'] + stats['misses']
+    stats.update({
+        "disk_hits": _disk_cache_hits,
+        "disk_entries": len(disk_files),
+        "disk_bytes": sum(os.path.getsize(path) for path in disk_files),
+        "disk_dir": MESH_CACHE_DIR,
+        "overall_hit_rate": (stats['hits'] + _disk_cache_hits) / lookups if lookups else 0.0
+    })
+    return stats
+
+def clear_mesh_cache(remove_files=False):
+    """Drop the in-process mesh cache and optionally delete the on-disk entries."""
+    global _disk_cache_hits
+    _mesh_cache.clear()
+    _disk_cache_hits = 0
+    if remove_files and os.path.isdir(MESH_CACHE_DIR):
+        for name in os.listdir(MESH_CACHE_DIR):
+            if name.endswith('.npz'):
+                os.remove(os.path.join(MESH_CACHE_DIR, name))
+
 def plot_geometry_and_generate_mesh(width=10, height=10, density=0.05, quality=30, 
-                                   with_holes=False, hole_rows=0, hole_cols=0, hole_radius=0.5):
+                                   with_holes=False, hole_rows=0, hole_cols=0, hole_radius=0.5,
+                                   use_cache=True, structured=False):
     """
     Generate a mesh with the specified parameters and return it.
     This function is compatible with both the original code and the holes version.
@@ -125,10 +369,21 @@ def plot_geometry_and_generate_mesh(width=10, height=10, density=0.05, quality=3
     hole_rows (int): Number of rows of holes (only used if with_holes=True)
     hole_cols (int): Number of columns of holes (only used if with_holes=True)
     hole_radius (float): Radius of the holes (only used if with_holes=True)
+    use_cache (bool): Reuse a previously generated mesh with the same parameters
+    structured (bool): Use the closed-form structured grid instead of Triangle
+                       (only for hole-free domains)
     
     Returns:
     dict: Mesh data including vertices, triangles, and boundary tags
     """
+    if use_cache:
+        return get_mesh_cached(
+            width, height, density, quality, with_holes, hole_rows, hole_cols, hole_radius, structured
+        )
+    if structured:
+        if with_holes and hole_rows > 0 and hole_cols > 0 and hole_radius > 0:
+            raise ValueError("Structured meshes are only available for domains without holes")
+        return generate_structured_mesh(width, height, density)
     return generate_mesh_with_options(
         width, height, density, quality, with_holes, hole_rows, hole_cols, hole_radius
     ) 
\ No newline at end of file
@@ -3,6 +3,7 @@ import triangle as tr
 import matplotlib.pyplot as plt
 from io import BytesIO
 import base64
+from mesh_generator_enhanced import BOTTOM_TAG, LEFT_TAG, TOP_TAG, RIGHT_TAG, boundary_tags_from_markers
 
 def generate_mesh_with_options(width=10, height=10, density=0.05, quality=30):
     """
@@ -17,29 +18,23 @@ def generate_mesh_with_options(width=10, height=10, density=0.05, quality=30):
     Returns:
     dict: Mesh data including vertices, triangles, and boundary tags
     """
-    # Create rectangle vertices
-    square_vertices = np.array([[0, 0], [width, 0], [width, height], [0, height]])
-    vertices = square_vertices
-    segments = np.array([[i, (i + 1) % 4] for i in range(4)])
+    # Create rectangle vertices; segments run bottom, right, top, left
+    vertices = np.array([[0, 0], [width, 0], [width, height], [0, height]], dtype=float)
+    segments = np.array([[0, 1], [1, 2], [2, 3], [3, 0]])
+    segment_markers = np.array([[BOTTOM_TAG], [RIGHT_TAG], [TOP_TAG], [LEFT_TAG]])
+    vertex_markers = np.array([[BOTTOM_TAG], [BOTTOM_TAG], [TOP_TAG], [LEFT_TAG]])
     
-    # Generate mesh with custom parameters
-    mesh_input = {'vertices': vertices, 'segments': segments}
-    mesh = tr.triangulate(mesh_input, f'pq{quality}a{density}')
+    # Generate mesh with custom parameters; boundary tags come from Triangle's markers
+    mesh_input = {
+        'vertices': vertices,
+        'segments': segments,
+        'segment_markers': segment_markers,
+        'vertex_markers': vertex_markers
+    }
+    mesh = tr.triangulate(mesh_input, f'pq{quality}a{np.format_float_positional(density, trim="-")}')
     
-    # Tag vertices based on their position
-    vertex_tags = np.zeros(len(mesh['vertices']))
-    for i, vertex in enumerate(mesh['vertices']):
-        x, y = vertex
-        if abs(y - 0) < 1e-10:  # Bottom edge (y = 0)
-            vertex_tags[i] = 1
-        elif abs(x - 0) < 1e-10:  # Left edge (x = 0)
-            vertex_tags[i] = 2
-        elif abs(y - height) < 1e-10:  # Top edge (y = height)
-            vertex_tags[i] = 3
-        elif abs(x - width) < 1e-10:  # Right edge (x = width)
-            vertex_tags[i] = 4
-    
-    mesh['ibntag'] = vertex_tags
+    # Interior vertices keep tag 0
+    mesh['ibntag'] = boundary_tags_from_markers(mesh['vertex_markers'], interior_tag=0)
     return mesh
 
 def plot_mesh_as_base64(mesh):
@@ -0,0 +1,40 @@
+import numpy as np
+
+
+class SnapshotSink:
+    """
+    Preallocated store for solution snapshots of a time-dependent solver.
+
+    Rows live either in memory or, when a path is given, in a memory-mapped
+    .npy file (readable later with np.load(path, mmap_mode='r')), so a long
+    history does not have to fit in RAM. num_points may also be a tuple for
+    snapshots with more than one axis, e.g. (num_members, num_points).
+    """
+
+    def __init__(self, capacity, num_points, path=None):
+        self.capacity = capacity
+        self.path = path
+        shape = (int(capacity),) + tuple(int(n) for n in np.atleast_1d(num_points))
+        if path is None:
+            self.values = np.empty(shape)
+        else:
+            self.values = np.lib.format.open_memmap(path, mode='w+', dtype=float, shape=shape)
+        self.times = np.empty(capacity)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, t, u):
+        """Copy u into the next free row and record its time."""
+        if self.count >= self.capacity:
+            raise IndexError(f"Snapshot sink is full ({self.capacity} snapshots)")
+        self.values[self.count] = u
+        self.times[self.count] = t
+        self.count += 1
+
+    def result(self):
+        """Return (times, values) of the snapshots recorded so far."""
+        if self.path is not None:
+            self.values.flush()
+        return self.times[:self.count], self.values[:self.count]
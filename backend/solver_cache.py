@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import scipy.sparse as sparse
+import scipy.sparse.linalg as spla
+
+
+def estimate_nbytes(obj):
+    """
+    Estimate the memory held by a cached value.
+
+    Handles NumPy arrays, scipy sparse matrices, SuperLU factorizations,
+    strings and dicts, lists and tuples of those; anything else counts as zero.
+
+    Parameters:
+    obj (object): Value to measure
+
+    Returns:
+    int: Approximate size in bytes
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if sparse.issparse(obj):
+        if hasattr(obj, 'indptr'):
+            return obj.data.nbytes + obj.indices.nbytes + obj.indptr.nbytes
+        return estimate_nbytes(sparse.csr_matrix(obj))
+    if isinstance(obj, spla.SuperLU):
+        # Reading obj.L / obj.U would build CSC copies of the factors, so
+        # count the stored nonzeros (float64 value + int32 index) instead
+        return (obj.nnz * (np.dtype(np.float64).itemsize + np.dtype(np.int32).itemsize)
+                + obj.perm_r.nbytes + obj.perm_c.nbytes)
+    if isinstance(obj, (str, bytes)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sum(estimate_nbytes(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(estimate_nbytes(value) for value in obj)
+    return 0
+
+
+class MemoryBoundedLRUCache:
+    """
+    Thread-safe least-recently-used cache with a memory budget.
+
+    Entries are evicted oldest-first once the summed size of the stored
+    values exceeds max_bytes. Values larger than the whole budget are not stored.
+    """
+
+    def __init__(self, max_bytes, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key, value, nbytes=None):
+        """Store value under key, evicting old entries to stay within budget."""
+        if nbytes is None:
+            nbytes = estimate_nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            while (self.current_bytes > self.max_bytes
+                   or (self.max_entries is not None and len(self._entries) > self.max_entries)):
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """Return entry count, memory use and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions
+            }